@@ -0,0 +1,40 @@
+"""
+Mide el rendimiento de emisión y verificación de tokens JWT.
+
+Uso (desde la raíz del repositorio):
+    python -m backend.benchmarks.auth_tokens --iterations 5000
+"""
+import argparse
+import time
+
+from ..login import auth
+
+
+def _rate(iterations: int, seconds: float) -> str:
+    return f"{iterations / seconds:,.0f} ops/s ({seconds / iterations * 1e6:.1f} µs/op)"
+
+
+def run(iterations: int):
+    start = time.perf_counter()
+    tokens = [auth.create_access_token({"sub": f"user{i}"}) for i in range(iterations)]
+    print(f"Emisión:                   {_rate(iterations, time.perf_counter() - start)}")
+
+    auth.token_cache.clear()
+    start = time.perf_counter()
+    for token in tokens:
+        auth.verify_token(token)
+    print(f"Verificación (sin caché):  {_rate(iterations, time.perf_counter() - start)}")
+
+    # Tokens repetidos, como un cliente que reutiliza el mismo token en cada llamada
+    hot_tokens = tokens[: min(len(tokens), auth.TOKEN_CACHE_SIZE)]
+    start = time.perf_counter()
+    for i in range(iterations):
+        auth.verify_token(hot_tokens[i % len(hot_tokens)])
+    print(f"Verificación (con caché):  {_rate(iterations, time.perf_counter() - start)}")
+    print(f"Caché de tokens: {auth.token_cache.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5000)
+    run(parser.parse_args().iterations)
@@ -0,0 +1,58 @@
+"""
+Compara las representaciones de la galería facial (float32, float16, int8)
+en memoria por usuario, velocidad de búsqueda y pérdida de exactitud frente
+a la búsqueda exacta en float32.
+
+Uso (desde la raíz del repositorio):
+    python -m backend.benchmarks.gallery_quantization --users 10000 --queries 2000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from ..login.gallery import GALLERY_DTYPES, EmbeddingGallery
+
+
+def run(n_users: int, n_queries: int, noise: float, seed: int):
+    rng = np.random.default_rng(seed)
+    embeddings = rng.standard_normal((n_users, 128)).astype(np.float32)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    labels = [f"user{i}" for i in range(n_users)]
+
+    # Consultas genuinas: embeddings de la galería con ruido gaussiano
+    targets = rng.integers(0, n_users, n_queries)
+    queries = embeddings[targets] + rng.normal(0, noise, (n_queries, 128)).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    reference = embeddings @ queries.T
+    exact_top1 = reference.argmax(axis=0)
+    exact_scores = reference.max(axis=0)
+    python_lists_bytes = n_users * (56 + 8 * 128 + 24 * 128)
+
+    print(f"{n_users} usuarios, {n_queries} consultas, ruido {noise}")
+    print(f"Listas de floats de Python (referencia): ~{python_lists_bytes / n_users:.0f} bytes/usuario\n")
+    print(f"{'tipo':<8} {'bytes/usuario':>13} {'consultas/s':>12} {'top-1 = exacto':>15} {'top-1 = real':>13} {'error sim. máx':>15}")
+
+    for dtype in GALLERY_DTYPES:
+        gallery = EmbeddingGallery(dtype).build(embeddings, labels)
+
+        start = time.perf_counter()
+        results = [gallery.search(q, top_k=1)[0] for q in queries]
+        elapsed = time.perf_counter() - start
+
+        top1 = np.array([index for index, _ in results])
+        scores = np.array([score for _, score in results])
+        print(f"{dtype:<8} {gallery.nbytes / n_users:>13.0f} {n_queries / elapsed:>12,.0f} "
+              f"{(top1 == exact_top1).mean() * 100:>14.2f}% {(top1 == targets).mean() * 100:>12.2f}% "
+              f"{np.abs(scores - exact_scores).max():>15.5f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--noise", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.users, args.queries, args.noise, args.seed)
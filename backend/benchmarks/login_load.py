@@ -0,0 +1,302 @@
+"""
+Generador de carga para /login que simula el tráfico de los kioscos.
+
+Lanza logins concurrentes (genuinos e impostores) contra un servidor uvicorn
+real por localhost, opcionalmente mezclados con registros concurrentes para
+exponer contención. Los handlers de /login no ceden el bucle de eventos, así
+que el tráfico siempre viaja por sockets reales; un transporte ASGI en proceso
+serializaría a todos los clientes.
+
+Siembra de usuarios sintéticos:
+- Sin --url, el generador escribe los usuarios en ./facial_auth.db y solo
+  después arranca uvicorn (subproceso en un puerto libre), de modo que el
+  servidor los carga en su galería al iniciar. Debe ejecutarse desde el
+  directorio de la base de datos del servidor (la raíz del repositorio).
+- Con --url, los usuarios se registran a través del servidor con POST /register
+  y un token de administrador firmado localmente, por lo que el generador debe
+  usar la misma JWT_SECRET_KEY que el servidor. Los embeddings se derivan de
+  --seed: repetir una ejecución con la misma semilla reutiliza los usuarios.
+
+El servidor arrancado hereda el entorno: con FACIAL_MATCH_MODE=svc (por defecto)
+y un solo embedding por usuario la probabilidad máxima ronda 1/N y los logins
+genuinos se rechazan; use FACIAL_MATCH_MODE=gallery para medir aceptaciones.
+
+Uso (desde la raíz del repositorio):
+    python -m backend.benchmarks.login_load --users 200 --concurrency 16 --duration 30
+    python -m backend.benchmarks.login_load --register-concurrency 2
+    python -m backend.benchmarks.login_load --url http://127.0.0.1:8000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+
+import httpx
+import numpy as np
+
+from ..login import auth, database, face_utils
+
+USER_PREFIX = "loadtest_"
+
+# Límites del limitador de /login en el servidor lanzado por el generador:
+# todo el tráfico llega desde 127.0.0.1 y, con los valores por defecto, se descartaría casi todo
+UNLIMITED_RATE_ENV = {"LOGIN_RATE_PER_SECOND": "1000000", "LOGIN_BURST": "1000000"}
+
+
+def _random_embedding(rng: np.random.Generator) -> list:
+    return face_utils.normalize_embedding(rng.standard_normal(128).tolist())
+
+
+def _synthetic_users(n_users: int, seed: int) -> dict:
+    """Usuarios sintéticos deterministas {nombre: embedding} para la semilla dada."""
+    rng = np.random.default_rng(seed)
+    return {f"{USER_PREFIX}s{seed}_{i:05d}": _random_embedding(rng) for i in range(n_users)}
+
+
+def populate_users(n_users: int, seed: int) -> dict:
+    """
+    Crea en la base de datos local los usuarios sintéticos que falten y retorna
+    {nombre: embedding} de todos los usuarios de carga presentes en ella.
+    Debe ejecutarse antes de arrancar el servidor, que solo lee la galería al iniciar.
+    """
+    database.init_db()
+    for nombre, embedding in _synthetic_users(n_users, seed).items():
+        database.save_user(nombre, embedding)
+
+    gallery = {}
+    for user in database.get_all_users():
+        if user.nombre.startswith(USER_PREFIX):
+            gallery[user.nombre] = json.loads(user.embedding)
+    return gallery
+
+
+async def register_users(client: httpx.AsyncClient, token: str, n_users: int, seed: int) -> dict:
+    """
+    Registra los usuarios sintéticos a través de POST /register del servidor.
+    Un 400 indica que el usuario ya existe de una ejecución anterior con la misma semilla.
+    """
+    headers = {"Authorization": f"Bearer {token}"}
+    users = _synthetic_users(n_users, seed)
+    created = 0
+    for nombre, embedding in users.items():
+        response = await client.post("/register", json={"nombre": nombre, "embedding": embedding}, headers=headers)
+        if response.status_code == 200:
+            created += 1
+        elif response.status_code != 400:
+            raise SystemExit(f"No se pudo registrar {nombre}: {response.status_code} {response.text}")
+    print(f"Usuarios sintéticos registrados en el servidor: {created} nuevos, {len(users) - created} existentes")
+    return users
+
+
+class Stats:
+    def __init__(self, workers: dict):
+        # Clientes lanzados por escenario; todos deben llegar a enviar solicitudes
+        self.workers = workers
+        self.latencies = defaultdict(list)
+        self.status = defaultdict(Counter)
+        self.per_worker = defaultdict(Counter)
+        self.outcomes = Counter()
+
+    def record(self, scenario: str, worker: int, latency: float, status: int):
+        self.latencies[scenario].append(latency)
+        self.status[scenario][status] += 1
+        self.per_worker[scenario][worker] += 1
+
+    def idle_workers(self) -> dict:
+        """Clientes de cada escenario que no enviaron ninguna solicitud."""
+        idle = {}
+        for scenario, n_workers in self.workers.items():
+            missing = [w for w in range(n_workers) if self.per_worker[scenario][w] == 0]
+            if missing:
+                idle[scenario] = missing
+        return idle
+
+    def report(self, elapsed: float):
+        print(f"\nDuración: {elapsed:.1f}s")
+        for scenario, latencies in self.latencies.items():
+            ms = np.array(latencies) * 1000.0
+            total = len(ms)
+            errors = sum(count for status, count in self.status[scenario].items() if status >= 500 or status == 0)
+            counts = [self.per_worker[scenario][w] for w in range(self.workers[scenario])]
+            print(f"\n[{scenario}] {total} solicitudes, {total / elapsed:.1f} req/s")
+            print(f"  latencia ms: p50={np.percentile(ms, 50):.1f} p90={np.percentile(ms, 90):.1f} "
+                  f"p99={np.percentile(ms, 99):.1f} max={ms.max():.1f}")
+            print(f"  solicitudes por cliente: min={min(counts)} max={max(counts)} ({len(counts)} clientes)")
+            print(f"  códigos: {dict(sorted(self.status[scenario].items()))}")
+            print(f"  tasa de error (5xx/conexión): {errors / total * 100:.2f}%")
+        if self.outcomes:
+            print(f"\nResultados de autenticación: {dict(self.outcomes)}")
+
+        idle = self.idle_workers()
+        if idle:
+            print(f"\nAVISO: clientes sin solicitudes (la carga no fue concurrente): {idle}")
+
+
+async def _login_worker(worker, client, gallery, args, deadline, stats, rng):
+    names = list(gallery)
+    while time.monotonic() < deadline:
+        genuine = rng.random() < args.genuine_ratio
+        if genuine:
+            expected = rng.choice(names)
+            noise = np.random.default_rng(rng.getrandbits(32)).normal(0, args.noise, 128)
+            embedding = (np.asarray(gallery[expected]) + noise).tolist()
+        else:
+            expected = None
+            embedding = _random_embedding(np.random.default_rng(rng.getrandbits(32)))
+
+        start = time.perf_counter()
+        try:
+            response = await client.post("/login", json={"embedding": embedding})
+            status = response.status_code
+        except httpx.HTTPError:
+            response, status = None, 0
+        stats.record("login", worker, time.perf_counter() - start, status)
+
+        if status == 200:
+            accepted = response.json().get("nombre")
+            if expected is None:
+                stats.outcomes["impostor_aceptado"] += 1
+            elif accepted == expected:
+                stats.outcomes["genuino_aceptado"] += 1
+            else:
+                stats.outcomes["genuino_confundido"] += 1
+        elif status == 401:
+            stats.outcomes["genuino_rechazado" if genuine else "impostor_rechazado"] += 1
+
+
+async def _register_worker(worker, client, token, deadline, stats, rng):
+    headers = {"Authorization": f"Bearer {token}"}
+    while time.monotonic() < deadline:
+        payload = {
+            "nombre": f"{USER_PREFIX}reg_{uuid.uuid4().hex[:12]}",
+            "embedding": _random_embedding(np.random.default_rng(rng.getrandbits(32))),
+        }
+        start = time.perf_counter()
+        try:
+            status = (await client.post("/register", json=payload, headers=headers)).status_code
+        except httpx.HTTPError:
+            status = 0
+        stats.record("register", worker, time.perf_counter() - start, status)
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(args):
+    """
+    Arranca la aplicación con uvicorn en un subproceso escuchando en localhost.
+    Retorna (proceso, url); la salida del servidor se guarda en args.server_log.
+    """
+    port = _free_port()
+    env = dict(os.environ)
+    if not args.keep_rate_limit:
+        env.update(UNLIMITED_RATE_ENV)
+    log = open(args.server_log, "w")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--host", "127.0.0.1", "--port", str(port)],
+        env=env, stdout=log, stderr=subprocess.STDOUT,
+    )
+    log.close()
+    return process, f"http://127.0.0.1:{port}"
+
+
+async def wait_until_ready(client: httpx.AsyncClient, timeout: float, process=None):
+    """
+    Espera a que la galería facial esté lista y a que ningún componente siga
+    cargándose, para que el entrenamiento de arranque no compita con la carga medida.
+    """
+    from ..readiness import FAILED, LOADING, PENDING
+    from ..routes import GALLERY_COMPONENT
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise SystemExit(f"El servidor terminó al arrancar (código {process.returncode})")
+        try:
+            components = (await client.get("/health/ready")).json()["components"]
+        except (httpx.HTTPError, ValueError, KeyError):
+            components = {}
+        gallery_status = components.get(GALLERY_COMPONENT, {}).get("status")
+        if gallery_status == FAILED:
+            raise SystemExit(f"La galería facial no se pudo cargar: {components[GALLERY_COMPONENT]['error']}")
+        if components and not any(c["status"] in (PENDING, LOADING) for c in components.values()):
+            print(f"Servidor listo: {json.dumps({name: c['status'] for name, c in components.items()})}")
+            return
+        await asyncio.sleep(0.5)
+    raise SystemExit(f"El servidor no estuvo listo en {timeout:.0f}s")
+
+
+async def run(args):
+    token = auth.create_access_token({"sub": "admin"})
+    process = None
+    if args.url:
+        url = args.url
+    else:
+        # La siembra termina antes de arrancar el servidor, que lee la galería al iniciar
+        gallery = populate_users(args.users, args.seed)
+        process, url = start_server(args)
+        print(f"Servidor uvicorn en {url} (salida en {args.server_log})")
+
+    try:
+        async with httpx.AsyncClient(base_url=url, timeout=args.timeout) as client:
+            await wait_until_ready(client, args.startup_timeout, process)
+            if args.url:
+                gallery = await register_users(client, token, args.users, args.seed)
+            if not gallery:
+                raise SystemExit("No hay usuarios sintéticos para generar tráfico genuino")
+            print(f"Usuarios sintéticos disponibles: {len(gallery)}")
+
+            rng = random.Random(args.seed)
+            stats = Stats({"login": args.concurrency, "register": args.register_concurrency})
+            deadline = time.monotonic() + args.duration
+            tasks = [_login_worker(w, client, gallery, args, deadline, stats, random.Random(rng.getrandbits(32)))
+                     for w in range(args.concurrency)]
+            tasks += [_register_worker(w, client, token, deadline, stats, random.Random(rng.getrandbits(32)))
+                      for w in range(args.register_concurrency)]
+            start = time.perf_counter()
+            await asyncio.gather(*tasks)
+            elapsed = time.perf_counter() - start
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    stats.report(elapsed)
+
+    if args.cleanup:
+        if args.url:
+            print("\n--cleanup solo limpia la base de datos local; se omite con --url")
+        else:
+            deleted = database.delete_users_with_prefix(USER_PREFIX)
+            print(f"\nUsuarios sintéticos eliminados: {deleted}")
+
+    if stats.idle_workers():
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100, help="Usuarios sintéticos en la base de datos")
+    parser.add_argument("--concurrency", type=int, default=8, help="Clientes de login concurrentes")
+    parser.add_argument("--register-concurrency", type=int, default=0, help="Clientes de registro concurrentes")
+    parser.add_argument("--duration", type=float, default=20.0, help="Duración de la prueba en segundos")
+    parser.add_argument("--genuine-ratio", type=float, default=0.8, help="Fracción de logins genuinos")
+    parser.add_argument("--noise", type=float, default=0.01, help="Ruido gaussiano añadido a los embeddings genuinos")
+    parser.add_argument("--url", default=None, help="URL de un servidor ya iniciado; si se omite, se arranca uno por localhost")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--startup-timeout", type=float, default=600.0, help="Segundos máximos de espera a que el servidor esté listo")
+    parser.add_argument("--server-log", default="login_load_server.log", help="Archivo con la salida del servidor arrancado")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep-rate-limit", action="store_true", help="No elevar el límite de /login en el servidor arrancado")
+    parser.add_argument("--cleanup", action="store_true", help="Eliminar los usuarios sintéticos al terminar")
+    asyncio.run(run(parser.parse_args()))
@@ -1,71 +1,264 @@
 import os
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import Dict, Any
+import json
+import traceback
+from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi.responses import StreamingResponse
+from typing import Dict, Any, List, Literal
 
 # Importa las funciones y modelos desde la ubicación correcta
-from .models import dengue_prediction
+from .models import dengue_prediction, dengue_training, dengue_risk, dengue_export
+from .cache import LRUCache
+from . import readiness
+from .login import auth
+from .dengue_schemas import PredictionRequest, PredictionResponse, BatchPredictionRequest, BatchPredictionResponse
 
 # Crea un nuevo router para los endpoints de predicción
 dengue_router = APIRouter()
 
+# Nombre del componente en el registro de disponibilidad
+DENGUE_MODELS_COMPONENT = "dengue_models"
+readiness.register(DENGUE_MODELS_COMPONENT)
+
+# Carpeta con los archivos de casos (entrenamiento y casos añadidos posteriormente)
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
 # Variables globales para los modelos y el DataFrame.
 models = {}
 df = None
 
-async def load_and_train_models():
+# Versión de los modelos cargados; se incrementa en cada reentrenamiento.
+model_version = 0
+
+# Duración (segundos) del último entrenamiento, por modelo y total.
+training_times = {}
+
+# Caché de resultados de predicción, indexada por (tipo, datos normalizados, versión).
+PREDICTION_CACHE_SIZE = int(os.getenv("DENGUE_PREDICTION_CACHE_SIZE", "4096"))
+PREDICTION_CACHE_TTL = float(os.getenv("DENGUE_PREDICTION_CACHE_TTL", "600"))
+prediction_cache = LRUCache(maxsize=PREDICTION_CACHE_SIZE, ttl=PREDICTION_CACHE_TTL)
+
+# Número de predicciones serializadas por bloque en las respuestas NDJSON
+NDJSON_CHUNK_SIZE = 500
+
+def load_and_train_models():
     """
     Carga los datos y entrena los modelos al iniciar el servidor.
+    Se ejecuta en segundo plano; el estado se reporta en /health/ready.
     """
-    global models, df
+    global models, df, model_version, training_times
     try:
-        data_file_path = os.path.join(os.path.dirname(__file__), 'data', 'dengue_data.csv')
+        data_file_path = os.path.join(DATA_DIR, 'dengue_data.csv')
         print(f"Intentando cargar el archivo de datos desde: {data_file_path}")
         df = dengue_prediction.load_data(data_file_path)
         if df is None:
             raise RuntimeError("No se pudo cargar el archivo CSV. Asegúrate de que esté en 'backend/data/dengue_data.csv'.")
         
         print("Entrenando modelos...")
-        models["severity"] = dengue_prediction.train_severity_model(df)
-        models["outbreak"] = dengue_prediction.train_outbreak_model(df)
-        models["trend"] = dengue_prediction.train_trend_model(df)
+        models, training_times = dengue_training.train_all_models(df)
+        dengue_prediction.precompute_trend_grid(models["trend"], df)
+        dengue_risk.build_district_profiles(df)
+
+        # Los resultados en caché pertenecen a los modelos anteriores
+        model_version += 1
+        prediction_cache.clear()
         print("Modelos listos para las predicciones.")
     except Exception as e:
         print(f"Error al cargar o entrenar los modelos: {e}")
+        raise
 
-# Define el modelo de datos para la solicitud POST
-class PredictionRequest(BaseModel):
-    prediction_type: str
-    input_data: Dict[str, Any]
+def _normalize_input(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Elimina los espacios sobrantes de los valores de texto. El resultado es lo
+    que se envía al predictor, de modo que la clave de caché y la predicción
+    se calculan sobre los mismos datos.
+    """
+    return {
+        key: value.strip() if isinstance(value, str) else value
+        for key, value in input_data.items()
+    }
 
-@dengue_router.post("/dengue/predict")
-async def get_dengue_prediction(request_data: PredictionRequest):
+def _cache_key(prediction_type: str, normalized_input: Dict[str, Any]):
     """
-    Recibe la petición del frontend y retorna la predicción solicitada.
+    Construye la clave de caché a partir del tipo de predicción, los datos de
+    entrada ya normalizados (claves ordenadas) y la versión de los modelos.
     """
-    global models
-    # Carga los modelos si no han sido cargados
-    if not models:
-        await load_and_train_models()
-        if not models:
-            raise HTTPException(status_code=500, detail="Los modelos no se pudieron cargar. Por favor, revisa el log del servidor.")
-            
-    prediction_type = request_data.prediction_type
-    input_data = request_data.input_data
-    
+    return (prediction_type, json.dumps(normalized_input, sort_keys=True, default=str), model_version)
+
+def _run_predictor(predictors: Dict[str, Any], prediction_type: str, model_input):
+    """
+    Ejecuta el predictor del tipo indicado.
+    Convierte los errores de entrada (KeyError, ValueError, TypeError) en HTTP 400
+    y el resto en HTTP 500.
+    """
+    if prediction_type not in predictors:
+        raise HTTPException(status_code=400, detail="Tipo de predicción no válido.")
+
     try:
-        if prediction_type == "severity":
-            result = dengue_prediction.predict_diagnosis_severity(models["severity"], input_data, df)
-        elif prediction_type == "outbreak":
-            result = dengue_prediction.predict_outbreak_risk(models["outbreak"], input_data, df)
-        elif prediction_type == "trend":
-            result = dengue_prediction.predict_case_count(models["trend"], input_data)
-        else:
-            raise HTTPException(status_code=400, detail="Tipo de predicción no válido.")
-        
-        return {"prediction": result}
-    
+        return predictors[prediction_type](models[prediction_type], model_input)
     except KeyError as e:
         raise HTTPException(status_code=400, detail=f"Faltan datos de entrada requeridos: {e}")
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=f"Datos de entrada inválidos: {e}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error en el servidor: {str(e)}")
+
+def _tag_result(prediction_type: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    result["prediction_type"] = prediction_type
+    result["model_version"] = model_version
+    return result
+
+def _predict_one(prediction_type: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Predice un solo caso con el predictor individual, que codifica el diccionario
+    directamente sin pasar por un DataFrame.
+    """
+    result = _run_predictor(dengue_prediction.PREDICTORS, prediction_type, input_data)
+    return _tag_result(prediction_type, result)
+
+def _predict_batch(prediction_type: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Ejecuta el predictor por lotes del tipo indicado y etiqueta cada resultado
+    con el tipo de predicción y la versión de los modelos.
+    """
+    results = _run_predictor(dengue_prediction.BATCH_PREDICTORS, prediction_type, records)
+    return [_tag_result(prediction_type, result) for result in results]
+
+@dengue_router.post("/dengue/predict", response_model=PredictionResponse)
+async def get_dengue_prediction(request_data: PredictionRequest):
+    """
+    Recibe la petición del frontend y retorna la predicción solicitada.
+    """
+    # Responde 503 mientras los modelos se entrenan en segundo plano
+    readiness.require_ready(DENGUE_MODELS_COMPONENT)
+
+    prediction_type = request_data.prediction_type
+    input_data = _normalize_input(request_data.input_data)
+
+    cache_key = _cache_key(prediction_type, input_data)
+    cached = prediction_cache.get(cache_key)
+    if cached is not None:
+        return {"prediction": cached}
+
+    result = _predict_one(prediction_type, input_data)
+    prediction_cache.set(cache_key, result)
+    return {"prediction": result}
+
+@dengue_router.post("/dengue/predict/batch", response_model=BatchPredictionResponse)
+async def get_dengue_batch_prediction(
+    request_data: BatchPredictionRequest,
+    format: Literal["json", "ndjson"] = "json",
+):
+    """
+    Predice un lote de casos del mismo tipo en una sola pasada del modelo.
+    Con format=ndjson la respuesta se transmite como una predicción por línea.
+    """
+    readiness.require_ready(DENGUE_MODELS_COMPONENT)
+
+    # El lote completo se evalúa antes de responder, así los errores de
+    # entrada se reportan con su código HTTP también en modo NDJSON.
+    records = [_normalize_input(record) for record in request_data.input_data]
+    results = _predict_batch(request_data.prediction_type, records)
+    if format == "json":
+        return {"predictions": results, "model_version": model_version}
+
+    def generate():
+        for start in range(0, len(results), NDJSON_CHUNK_SIZE):
+            chunk = results[start:start + NDJSON_CHUNK_SIZE]
+            yield "".join(json.dumps(result, ensure_ascii=False) + "\n" for result in chunk)
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+@dengue_router.get("/dengue/cache")
+async def get_prediction_cache_stats():
+    """
+    Retorna los contadores de la caché de predicciones.
+    """
+    return {"model_version": model_version, "training_times": training_times, **prediction_cache.stats()}
+
+@dengue_router.get("/dengue/risk-map")
+async def get_risk_map(
+    ano: int,
+    semana_inicio: int = Query(..., ge=1, le=53),
+    semana_fin: int = Query(None, ge=1, le=53),
+    min_probability: float = Query(0.0, ge=0.0, le=1.0),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(100, ge=1, le=1000),
+):
+    """
+    Retorna el riesgo de brote de todos los distritos para un rango de semanas,
+    ordenado por probabilidad y paginado para el renderizado de mapas.
+    """
+    readiness.require_ready(DENGUE_MODELS_COMPONENT)
+
+    semana_fin = semana_inicio if semana_fin is None else semana_fin
+    if semana_fin < semana_inicio:
+        raise HTTPException(status_code=400, detail="semana_fin debe ser mayor o igual que semana_inicio.")
+
+    # El mapa completo se calcula una vez y se reutiliza entre páginas
+    cache_key = ("risk_map", ano, semana_inicio, semana_fin, model_version)
+    risk_map = prediction_cache.get(cache_key)
+    if risk_map is None:
+        try:
+            risk_map = dengue_risk.score_districts(models["outbreak"], models["trend"], ano, semana_inicio, semana_fin)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error en el servidor: {str(e)}")
+        prediction_cache.set(cache_key, risk_map)
+
+    risk_map = risk_map.filter(min_probability)
+    offset = (page - 1) * page_size
+    return {
+        "ano": ano,
+        "semana_inicio": semana_inicio,
+        "semana_fin": semana_fin,
+        "model_version": model_version,
+        "total": len(risk_map),
+        "page": page,
+        "page_size": page_size,
+        "items": risk_map.page(offset, page_size),
+    }
+
+@dengue_router.get("/dengue/export")
+async def export_scored_cases(
+    archivo: str = "dengue_data.csv",
+    format: Literal["ndjson", "csv"] = "ndjson",
+    chunksize: int = Query(dengue_export.DEFAULT_CHUNK_SIZE, ge=100, le=100000),
+    token: dict = Depends(auth.require_admin),
+):
+    """
+    Transmite un archivo de casos de la carpeta de datos puntuado con los modelos
+    de severidad y brote, leyéndolo por bloques con memoria constante.
+    Contiene registros individuales de pacientes, por lo que es exclusivo del administrador.
+    """
+    readiness.require_ready(DENGUE_MODELS_COMPONENT)
+
+    # Solo se permiten archivos dentro de la carpeta de datos
+    path = os.path.join(DATA_DIR, os.path.basename(archivo))
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail=f"No se encontró el archivo '{archivo}'.")
+
+    progreso = {"filas": 0}
+
+    def log_progress(filas, segundos):
+        progreso["filas"] = filas
+        print(f"Exportación de '{archivo}': {filas} filas en {segundos:.1f}s")
+
+    def stream():
+        # El código 200 ya se envió: un error a mitad de la exportación se
+        # registra y, en NDJSON, se reporta con una línea final de error.
+        # En CSV se corta la transmisión para que el cliente no la dé por completa.
+        try:
+            yield from dengue_export.iter_export(path, models["severity"], models["outbreak"], format, chunksize, log_progress)
+        except Exception as e:
+            print(f"Error en la exportación de '{archivo}' tras {progreso['filas']} filas: {e}")
+            print(f"Full traceback: {traceback.format_exc()}")
+            if format != "ndjson":
+                raise
+            yield json.dumps({"error": str(e), "filas_exportadas": progreso["filas"]}, ensure_ascii=False) + "\n"
+
+    media_type = "application/x-ndjson" if format == "ndjson" else "text/csv"
+    nombre_salida = os.path.splitext(os.path.basename(archivo))[0] + f"_puntuado.{format}"
+    return StreamingResponse(
+        stream(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{nombre_salida}"'},
+    )
@@ -0,0 +1,38 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Union
+
+class PredictionRequest(BaseModel):
+    prediction_type: str
+    input_data: Dict[str, Any]
+
+class BatchPredictionRequest(BaseModel):
+    prediction_type: str
+    input_data: List[Dict[str, Any]] = Field(..., min_items=1, max_items=10000)
+
+class ClassPrediction(BaseModel):
+    prediction_type: Literal["severity", "outbreak"]
+    clase_index: int
+    clase: str
+    probabilidad: float
+    probabilidades: List[float]
+    # Columnas categóricas ausentes o con valores no vistos en el entrenamiento (codificadas como desconocidas)
+    campos_desconocidos: List[str] = []
+    model_version: int
+
+class TrendPrediction(BaseModel):
+    prediction_type: Literal["trend"]
+    distrito: str
+    distrito_codigo: int
+    semana: int
+    casos_esperados: float
+    casos: int
+    model_version: int
+
+Prediction = Union[ClassPrediction, TrendPrediction]
+
+class PredictionResponse(BaseModel):
+    prediction: Prediction
+
+class BatchPredictionResponse(BaseModel):
+    predictions: List[Prediction]
+    model_version: int
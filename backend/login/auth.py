@@ -1,12 +1,24 @@
+import hashlib
+import os
+import time
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from ..cache import LRUCache
+from .database import get_user_by_name
 
-SECRET_KEY = "your-secret-key-change-in-production"
-ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
+SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
+ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+TOKEN_CACHE_SIZE = int(os.getenv("JWT_TOKEN_CACHE_SIZE", "1024"))
+
+if SECRET_KEY == "your-secret-key-change-in-production":
+    print("WARNING: JWT_SECRET_KEY not set, using the insecure default key")
+
+# Tokens validados recientemente, indexados por su hash y válidos hasta su 'exp'
+token_cache = LRUCache(maxsize=TOKEN_CACHE_SIZE)
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer(auto_error=False)
@@ -24,13 +36,25 @@ def create_access_token(data: dict):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
 def verify_token(token: str):
+    key = _token_key(token)
+    payload = token_cache.get(key)
+    if payload is not None:
+        return payload
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         return None
 
+    remaining = payload.get("exp", 0) - time.time()
+    if remaining > 0:
+        token_cache.set(key, payload, ttl=remaining)
+    return payload
+
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     if not credentials:
         raise HTTPException(
@@ -49,4 +73,18 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
     return payload
 
 def is_admin(payload: dict) -> bool:
-    return payload.get("is_admin", True)
\ No newline at end of file
+    return payload.get("is_admin", True)
+
+def require_admin(payload: dict = Depends(get_current_user)) -> dict:
+    """
+    Dependencia para endpoints exclusivos del administrador. No confía en el claim
+    'is_admin' del token (todo token de login lo incluye) sino en el flag de la
+    base de datos del usuario 'sub'.
+    """
+    user = get_user_by_name(payload.get("sub", ""))
+    if not user or not user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Se requieren privilegios de administrador",
+        )
+    return payload
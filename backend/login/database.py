@@ -1,5 +1,6 @@
 import sqlite3
 import json
+import os
 import numpy as np
 from typing import List, Optional
 from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, Boolean
@@ -114,6 +115,19 @@ def get_all_users():
     finally:
         db.close()
 
+def get_users_version():
+    """
+    Versión barata de la tabla de usuarios: (mtime en ns, tamaño) del archivo SQLite.
+    Cambia con cualquier escritura confirmada, incluidas las de otros procesos y las
+    actualizaciones en el mismo registro (p. ej. /setup-admin), que no alteran el
+    número de usuarios ni el id máximo. Retorna None si el archivo no existe.
+    """
+    try:
+        stat = os.stat(engine.url.database)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
 def get_user_count():
     from sqlalchemy.orm import Session
     db = SessionLocal()
@@ -122,6 +136,20 @@ def get_user_count():
     finally:
         db.close()
 
+def delete_users_with_prefix(prefix: str) -> int:
+    """Elimina los usuarios (no administradores) cuyo nombre empieza con el prefijo dado"""
+    db = SessionLocal()
+    try:
+        deleted = db.query(User).filter(User.nombre.startswith(prefix), User.is_admin == False).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+    except Exception as e:
+        print(f"Error deleting users with prefix {prefix}: {e}")
+        db.rollback()
+        return 0
+    finally:
+        db.close()
+
 def update_admin_embedding(nombre: str, embedding: List[float]):
     """Actualiza el embedding del admin"""
     from sqlalchemy.orm import Session
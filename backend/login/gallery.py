@@ -0,0 +1,113 @@
+import numpy as np
+from typing import List, Tuple
+
+GALLERY_DTYPES = ("float32", "float16", "int8")
+
+# Candidatos del recorrido int8 que se reordenan con similitud float32
+DEFAULT_RERANK_CANDIDATES = 16
+
+# Filas convertidas a la vez durante la búsqueda
+SEARCH_BLOCK_ROWS = 4096
+
+
+class EmbeddingGallery:
+    """
+    Galería compacta de embeddings normalizados (N x 128).
+
+    - float32: matriz float32 (512 bytes por usuario).
+    - float16: matriz float16 (256 bytes por usuario).
+    - int8: cuantización escalar simétrica por fila, x ~= q * scale
+      (128 bytes + 4 de escala por usuario). La búsqueda recorre la galería
+      con el producto punto de los códigos int8 escalado por fila y reordena
+      los mejores candidatos con similitud float32.
+    """
+
+    def __init__(self, dtype: str = "float32"):
+        if dtype not in GALLERY_DTYPES:
+            raise ValueError(f"Tipo de galería no soportado: {dtype}")
+        self.dtype = dtype
+        self.labels: List[str] = []
+        self._data = np.zeros((0, 128), dtype=np.float32 if dtype != "int8" else np.int8)
+        self._scales = np.zeros(0, dtype=np.float32)
+
+    @staticmethod
+    def _quantize(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        scales = np.abs(matrix).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        quantized = np.round(matrix / scales[:, None]).astype(np.int8)
+        return quantized, scales.astype(np.float32)
+
+    def build(self, embeddings: List[List[float]], labels: List[str]):
+        matrix = np.asarray(embeddings, dtype=np.float32).reshape(-1, 128)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix = matrix / norms
+
+        self.labels = list(labels)
+        if self.dtype == "int8":
+            self._data, self._scales = self._quantize(matrix)
+        else:
+            self._data = matrix.astype(self.dtype)
+        return self
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __getitem__(self, index: int) -> np.ndarray:
+        return self._rows_float32(np.array([index]))[0]
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes + (self._scales.nbytes if self.dtype == "int8" else 0)
+
+    def _rows_float32(self, indices: np.ndarray) -> np.ndarray:
+        rows = self._data[indices].astype(np.float32)
+        if self.dtype == "int8":
+            rows *= self._scales[indices, None]
+        return rows
+
+    def _blocked_dot(self, q: np.ndarray, acc_dtype) -> np.ndarray:
+        """Producto punto de toda la galería con q, ampliando el tipo por bloques para acotar la memoria temporal."""
+        if self._data.dtype == acc_dtype:
+            return self._data @ q
+        scores = np.empty(len(self), dtype=acc_dtype)
+        for start in range(0, len(self), SEARCH_BLOCK_ROWS):
+            block = self._data[start:start + SEARCH_BLOCK_ROWS]
+            scores[start:start + len(block)] = block.astype(acc_dtype) @ q
+        return scores
+
+    def to_float32(self) -> np.ndarray:
+        """Matriz completa descuantizada, para entrenar el clasificador."""
+        return self._rows_float32(np.arange(len(self)))
+
+    def search(self, query: List[float], top_k: int = 1,
+               rerank_candidates: int = DEFAULT_RERANK_CANDIDATES) -> List[Tuple[int, float]]:
+        """
+        Retorna [(índice, similitud coseno)] de los top_k embeddings más parecidos.
+        """
+        if len(self) == 0:
+            return []
+
+        q = np.asarray(query, dtype=np.float32)[:128]
+        norm = np.linalg.norm(q)
+        if norm == 0 or np.isnan(norm):
+            return []
+        q = q / norm
+
+        if self.dtype == "int8":
+            q_scale = max(float(np.abs(q).max()) / 127.0, 1e-12)
+            # Los productos int8 se acumulan en float32 (BLAS); son exactos porque
+            # |suma| <= 127 * 127 * 128 < 2**24
+            q_int = np.round(q / q_scale).astype(np.float32)
+            # Cada fila tiene su propia escala: sin ella el orden favorecería
+            # las filas con menor valor absoluto máximo
+            approx = self._blocked_dot(q_int, np.float32) * self._scales
+            n_candidates = min(len(self), max(top_k, rerank_candidates))
+            candidates = np.argpartition(-approx, n_candidates - 1)[:n_candidates]
+            scores = self._rows_float32(candidates) @ q
+        else:
+            candidates = np.arange(len(self))
+            scores = self._blocked_dot(q, np.float32)
+
+        order = np.argsort(-scores)[:top_k]
+        return [(int(candidates[i]), float(scores[i])) for i in order]
@@ -4,9 +4,17 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.pipeline import Pipeline
 import joblib
 import json
+import os
 from typing import List, Optional
-from .database import get_all_users
-from .face_utils import cosine_similarity
+from .database import get_all_users, get_users_version
+from .gallery import EmbeddingGallery
+
+# Representación de la galería en memoria: float32, float16 o int8
+GALLERY_DTYPE = os.getenv("FACIAL_GALLERY_DTYPE", "float32")
+
+# Estrategia de reconocimiento con 2 o más usuarios: "svc" (clasificador) o
+# "gallery" (vecino más cercano por similitud coseno sobre la galería)
+MATCH_MODE = os.getenv("FACIAL_MATCH_MODE", "svc")
 
 class FacialAuthModel:
     def __init__(self):
@@ -15,13 +23,17 @@ class FacialAuthModel:
             ('svc', SVC(probability=True, kernel='linear', C=1.0))
         ])
         self.labels = []
-        self.embeddings = []
+        self.embeddings = EmbeddingGallery(GALLERY_DTYPE)
         self.threshold = 0.6
+        # Versión de la base de datos con la que se cargó la galería
+        self.data_version = None
 
     def load_data(self):
+        # La versión se toma antes de leer: una escritura concurrente provoca otra recarga
+        self.data_version = get_users_version()
         users = get_all_users()
-        self.labels = []
-        self.embeddings = []
+        labels = []
+        embeddings = []
 
         for user in users:
             try:
@@ -30,8 +42,8 @@ class FacialAuthModel:
                     valid_embedding = [float(x) for x in embedding[:128]]
                     if not any(np.isnan(valid_embedding)) and not any(np.isinf(valid_embedding)):
                         if not all(x == 0.0 for x in valid_embedding):
-                            self.embeddings.append(valid_embedding)
-                            self.labels.append(user.nombre)
+                            embeddings.append(valid_embedding)
+                            labels.append(user.nombre)
                             print(f"Loaded user: {user.nombre} with valid embedding")
                         else:
                             print(f"Skipping user {user.nombre}: default embedding (all zeros)")
@@ -42,7 +54,13 @@ class FacialAuthModel:
             except Exception as e:
                 print(f"Error loading user {user.nombre}: {e}")
 
-        print(f"Total valid embeddings loaded: {len(self.embeddings)}")
+        self.embeddings = EmbeddingGallery(GALLERY_DTYPE).build(embeddings, labels)
+        self.labels = self.embeddings.labels
+        print(f"Total valid embeddings loaded: {len(self.embeddings)} ({self.embeddings.nbytes} bytes, {GALLERY_DTYPE})")
+
+    def is_stale(self) -> bool:
+        """Indica si la base de datos cambió desde la última carga (p. ej. en otro proceso)."""
+        return get_users_version() != self.data_version
 
     def train(self):
         if len(self.embeddings) == 0:
@@ -53,12 +71,16 @@ class FacialAuthModel:
             print("Only one user detected - using direct comparison mode")
             return True
 
+        if MATCH_MODE == "gallery":
+            print(f"Gallery matching mode - no classifier training needed ({len(self.embeddings)} users)")
+            return True
+
         if len(self.embeddings) < 2:
             print("Need at least 2 users to train the model")
             return False
 
         try:
-            X = np.array(self.embeddings, dtype=np.float32)
+            X = self.embeddings.to_float32()
             y = np.array(self.labels)
 
             if len(np.unique(y)) < 2:
@@ -88,13 +110,14 @@ class FacialAuthModel:
                 print("Invalid embedding: contains NaN or Inf")
                 return None
 
-            if len(self.embeddings) == 1:
-                similarity = cosine_similarity(input_embedding, self.embeddings[0])
+            if len(self.embeddings) == 1 or MATCH_MODE == "gallery":
+                matches = self.embeddings.search(input_embedding, top_k=1)
+                index, similarity = matches[0] if matches else (0, 0.0)
                 print(f"Direct comparison similarity: {similarity}")
                 
                 if similarity >= self.threshold:
-                    print(f"Predicted user: {self.labels[0]} with similarity {similarity}")
-                    return self.labels[0]
+                    print(f"Predicted user: {self.labels[index]} with similarity {similarity}")
+                    return self.labels[index]
                 else:
                     print(f"Similarity too low: {similarity} < {self.threshold}")
                     return None
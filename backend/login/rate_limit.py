@@ -0,0 +1,86 @@
+import hashlib
+import os
+import threading
+import time
+from typing import List
+
+import numpy as np
+
+from ..cache import LRUCache
+
+LOGIN_RATE_PER_SECOND = float(os.getenv("LOGIN_RATE_PER_SECOND", "2"))
+LOGIN_BURST = int(os.getenv("LOGIN_BURST", "10"))
+REJECTED_CACHE_TTL = float(os.getenv("LOGIN_REJECTED_CACHE_TTL", "30"))
+
+# Una tasa de 0 haría fallar retry_after (división por cero) en la primera solicitud
+# limitada; se valida al importar. Para desactivar el limitador use login_limiter.enabled.
+if not LOGIN_RATE_PER_SECOND > 0:
+    raise ValueError(f"LOGIN_RATE_PER_SECOND debe ser mayor que 0 (valor: {LOGIN_RATE_PER_SECOND})")
+if LOGIN_BURST < 1:
+    raise ValueError(f"LOGIN_BURST debe ser al menos 1 (valor: {LOGIN_BURST})")
+
+# Escala de cuantización de los embeddings normalizados ([-1, 1] -> [-64, 64])
+FINGERPRINT_SCALE = 64
+
+
+class TokenBucketLimiter:
+    """
+    Limitador token bucket por cliente. Cada cliente acumula hasta `capacity`
+    fichas que se recargan a `rate` fichas por segundo; el número de clientes
+    registrados está acotado.
+    """
+
+    def __init__(self, rate: float, capacity: int, max_clients: int = 10000):
+        if not rate > 0:
+            raise ValueError(f"La tasa de recarga debe ser mayor que 0 (valor: {rate})")
+        if capacity < 1:
+            raise ValueError(f"La capacidad debe ser al menos 1 (valor: {capacity})")
+        self.rate = rate
+        self.capacity = capacity
+        self.enabled = True
+        self._buckets = LRUCache(maxsize=max_clients)
+        self._lock = threading.Lock()
+
+    def allow(self, client: str) -> bool:
+        if not self.enabled:
+            return True
+
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(client, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - last) * self.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets.set(client, (tokens, now))
+        return allowed
+
+    def retry_after(self) -> int:
+        return max(1, int(np.ceil(1 / self.rate)))
+
+
+def embedding_fingerprint(normalized_embedding: List[float]) -> str:
+    """Hash del embedding normalizado cuantizado a int8, para detectar intentos repetidos."""
+    quantized = np.round(np.asarray(normalized_embedding, dtype=np.float32) * FINGERPRINT_SCALE).astype(np.int8)
+    return hashlib.sha1(quantized.tobytes()).hexdigest()
+
+
+login_limiter = TokenBucketLimiter(LOGIN_RATE_PER_SECOND, LOGIN_BURST)
+
+# Huellas de embeddings rechazados recientemente; se vacía al registrar usuarios
+rejected_embeddings = LRUCache(maxsize=10000, ttl=REJECTED_CACHE_TTL)
+
+# Contadores de solicitudes descartadas sin ejecutar el reconocimiento
+shed_counters = {"rate_limited": 0, "rejected_cache_hits": 0}
+
+
+def is_recently_rejected(fingerprint: str) -> bool:
+    """Indica si la huella se rechazó hace poco; cada acierto cuenta como solicitud descartada."""
+    if rejected_embeddings.get(fingerprint) is None:
+        return False
+    shed_counters["rejected_cache_hits"] += 1
+    return True
+
+
+def remember_rejected(fingerprint: str):
+    rejected_embeddings.set(fingerprint, True)
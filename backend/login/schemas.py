@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, validator
-from typing import List
+from typing import List, Optional
 
 class RegisterRequest(BaseModel):
     nombre: str = Field(..., min_length=1, max_length=100)
@@ -60,4 +60,11 @@ class UserMetrics(BaseModel):
 
 class MetricsResponse(BaseModel):
     accuracy: float
-    users_by_day: List[UserMetrics]
\ No newline at end of file
+    users_by_day: List[UserMetrics]
+
+class ProfilingConfigRequest(BaseModel):
+    enabled: bool
+    sample_rate: float = Field(1.0, gt=0, le=1)
+    duration_seconds: Optional[float] = Field(None, gt=0)
+    interval_ms: float = Field(5.0, ge=1, le=1000)
+    endpoints: Optional[List[str]] = None
@@ -1,7 +1,10 @@
 #import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from .login import database
+from . import readiness
+from .profiling import ProfilingMiddleware
 from . import routes
 from . import dengue_routes  # Usamos la importación relativa correcta
 
@@ -15,9 +18,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Perfilador bajo demanda de los endpoints críticos (desactivado por defecto)
+app.add_middleware(ProfilingMiddleware)
+
 @app.on_event("startup")
 def on_startup():
     database.init_db()
+    # La galería facial y los modelos de dengue se cargan en segundo plano
+    # para no bloquear el arranque; su estado se consulta en /health/ready.
+    readiness.start_background(routes.GALLERY_COMPONENT, routes.load_gallery)
+    readiness.start_background(dengue_routes.DENGUE_MODELS_COMPONENT, dengue_routes.load_and_train_models)
 
 # Incluye ambos routers en tu aplicación.
 # Cada uno manejará un conjunto de rutas diferente.
@@ -26,4 +36,17 @@ app.include_router(dengue_routes.dengue_router)
 
 @app.get("/")
 def read_root():
-    return {"message": "Sistema de Autenticación Facial y Predicción de Dengue"}
\ No newline at end of file
+    return {"message": "Sistema de Autenticación Facial y Predicción de Dengue"}
+
+@app.get("/health/live")
+def health_live():
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+def health_ready():
+    ready = readiness.all_ready()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, "components": readiness.snapshot()},
+        headers=None if ready else {"Retry-After": str(readiness.RETRY_AFTER_SECONDS)},
+    )
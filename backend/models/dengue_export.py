@@ -0,0 +1,94 @@
+"""
+Exportación por bloques de casos de dengue puntuados con los modelos de
+severidad y brote, en formato NDJSON o CSV.
+
+Uso como comando (desde la raíz del repositorio):
+    python -m backend.models.dengue_export --input casos.csv --output casos_puntuados.ndjson
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from . import dengue_prediction
+
+# Filas leídas y puntuadas por bloque; la memoria usada depende solo de este valor
+DEFAULT_CHUNK_SIZE = 5000
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+
+def score_chunk(chunk, severity_model, outbreak_model):
+    """
+    Agrega a un bloque de casos crudos las columnas de severidad y riesgo de brote.
+    """
+    X = dengue_prediction.prepare_features(chunk)
+    severidad = severity_model.predict(X, batch_size=1024, verbose=0)
+    brote = outbreak_model.predict(X, batch_size=1024, verbose=0)[:, 0]
+
+    indices = severidad.argmax(axis=1)
+    chunk = chunk.copy()
+    chunk['severidad_clase'] = np.asarray(dengue_prediction.diagnosticos_clases)[indices]
+    # Redondeo en float64 para que la salida no muestre artefactos de float32
+    chunk['severidad_probabilidad'] = severidad[np.arange(len(indices)), indices].astype(np.float64).round(4)
+    chunk['brote_probabilidad'] = brote.astype(np.float64).round(4)
+    return chunk
+
+
+def iter_export(path, severity_model, outbreak_model, format="ndjson", chunksize=DEFAULT_CHUNK_SIZE, progress=None):
+    """
+    Lee el archivo de casos por bloques, los puntúa y genera la salida
+    serializada bloque a bloque. progress(filas, segundos) se invoca tras cada bloque.
+    """
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Formato no soportado: {format}")
+
+    inicio = time.perf_counter()
+    filas = 0
+    for numero, chunk in enumerate(pd.read_csv(path, sep=';', chunksize=chunksize)):
+        puntuado = score_chunk(chunk, severity_model, outbreak_model)
+        if format == "ndjson":
+            yield puntuado.to_json(orient='records', lines=True, force_ascii=False).rstrip("\n") + "\n"
+        else:
+            yield puntuado.to_csv(sep=';', index=False, header=numero == 0)
+
+        filas += len(chunk)
+        if progress is not None:
+            progress(filas, time.perf_counter() - inicio)
+
+
+def _print_progress(filas, segundos):
+    print(f"\r{filas} filas puntuadas ({filas / max(segundos, 1e-9):,.0f} filas/s)", end="", file=sys.stderr, flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", required=True, help="Archivo CSV (separado por ';') con los casos a puntuar")
+    parser.add_argument("--output", required=True, help="Archivo de salida")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default=None, help="Formato de salida (por defecto, según la extensión)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--training-data", default=os.path.join(os.path.dirname(__file__), '..', 'data', 'dengue_data.csv'),
+                        help="CSV usado para ajustar los codificadores y entrenar los modelos")
+    args = parser.parse_args()
+
+    formato = args.format or ("csv" if args.output.endswith(".csv") else "ndjson")
+
+    from . import dengue_training
+    df = dengue_prediction.load_data(args.training_data)
+    if df is None:
+        sys.exit(1)
+    print("Entrenando modelos...", file=sys.stderr)
+    models, _ = dengue_training.train_all_models(df)
+    del df
+
+    with open(args.output, "w", encoding="utf-8", newline="") as salida:
+        for bloque in iter_export(args.input, models["severity"], models["outbreak"], formato, args.chunksize, _print_progress):
+            salida.write(bloque)
+    print(f"\nExportación completada: {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
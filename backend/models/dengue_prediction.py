@@ -1,99 +1,272 @@
 import pandas as pd
 import numpy as np
 import os
-from sklearn.model_selection import train_test_split
+import time
 from sklearn.preprocessing import LabelEncoder
+import tensorflow as tf
 import tensorflow.keras as keras
 
+# Columnas categóricas que se codifican como enteros
+CATEGORICAL_COLUMNS = ['departamento', 'provincia', 'distrito', 'enfermedad', 'tipo_dx', 'diresa', 'tipo_edad', 'sexo']
+
+# Código asignado a valores categóricos no vistos durante el entrenamiento
+UNKNOWN_CODE = -1
+
 # Diccionario global para almacenar los LabelEncoders y el OneHotEncoder
 label_encoders = {}
 one_hot_encoder = None
 diagnosticos_clases = []
 
+# Tablas precompiladas {valor: código} por columna, derivadas de los LabelEncoders.
+# Se usan en las predicciones en lugar de LabelEncoder.transform.
+encoding_tables = {}
+
+# Columnas de entrada de los modelos de severidad y brote, en orden de entrenamiento
+feature_columns = []
+
+# Rejilla precalculada de casos esperados indexada por [código de distrito, semana]
+trend_grid = None
+
+# Columnas de etiquetas; no forman parte de las características de entrada
+LABEL_COLUMNS = ['diagnostic_label', 'outbreak_label']
+
+# Rango válido de semanas epidemiológicas
+EPI_WEEK_MIN = 1
+EPI_WEEK_MAX = 53
+
+# Parámetros comunes de entrenamiento
+TRAINING_EPOCHS = 10
+TRAINING_BATCH_SIZE = 32
+VALIDATION_SPLIT = 0.2
+
+def _code_dtype(n_clases):
+    """Tipo entero más pequeño que representa los códigos de n_clases categorías."""
+    return np.int16 if n_clases <= np.iinfo(np.int16).max else np.int32
+
 def load_data(path):
     """
     Carga y preprocesa el archivo CSV.
     Realiza la codificación de variables categóricas.
     """
-    global label_encoders, diagnosticos_clases
+    global label_encoders, diagnosticos_clases, encoding_tables, feature_columns
     try:
         df = pd.read_csv(path, sep=';')
     except FileNotFoundError:
         print(f"Error: No se encontró el archivo '{os.path.basename(path)}' en la ruta '{os.path.dirname(path)}'.")
         return None
     
-    # Copia la columna 'diagnostic' para usarla como etiquetas
-    df['diagnostic_label'] = df['diagnostic']
-    
-    # Codifica las variables categóricas con LabelEncoder
-    for col in ['departamento', 'provincia', 'distrito', 'enfermedad', 'tipo_dx', 'diresa', 'tipo_edad', 'sexo']:
+    # Codifica las variables categóricas con LabelEncoder, usando el entero más pequeño posible
+    for col in CATEGORICAL_COLUMNS:
         le = LabelEncoder()
-        df[col] = le.fit_transform(df[col].astype(str))
+        codigos = le.fit_transform(df[col].astype(str))
+        df[col] = codigos.astype(_code_dtype(len(le.classes_)))
         label_encoders[col] = le
+        encoding_tables[col] = {clase: codigo for codigo, clase in enumerate(le.classes_)}
     
     # Codifica la columna 'diagnostic' para la clasificación multiclase
     le_diagnostic = LabelEncoder()
-    df['diagnostic_label'] = le_diagnostic.fit_transform(df['diagnostic_label'].astype(str))
+    codigos = le_diagnostic.fit_transform(df['diagnostic'].astype(str))
+    df['diagnostic_label'] = codigos.astype(_code_dtype(len(le_diagnostic.classes_)))
     diagnosticos_clases = le_diagnostic.classes_
     label_encoders['diagnostic_label'] = le_diagnostic
+
+    # Etiqueta de brote: es un caso positivo (>0) o no. La columna original ya no se necesita.
+    df['outbreak_label'] = (df['diagnostic'] > 0).astype(np.int8)
+    df.drop(columns=['diagnostic'], inplace=True)
+
+    # Reduce las columnas numéricas enteras al tipo más pequeño que las contiene
+    for col in df.columns:
+        if col not in CATEGORICAL_COLUMNS and col not in LABEL_COLUMNS and pd.api.types.is_integer_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+
+    feature_columns = list(df.columns.drop(LABEL_COLUMNS))
     
     return df
 
+def encode_value(col, value):
+    """
+    Codifica un valor categórico con la tabla precompilada.
+    Los valores no vistos en el entrenamiento se asignan a UNKNOWN_CODE.
+    """
+    return encoding_tables[col].get(str(value), UNKNOWN_CODE)
+
+def encode_categorical(input_df):
+    """
+    Codifica in-place las columnas categóricas presentes en input_df.
+    Los valores desconocidos o nulos se asignan a UNKNOWN_CODE en lugar de lanzar un error.
+    """
+    for col in CATEGORICAL_COLUMNS:
+        if col in input_df.columns and col in encoding_tables:
+            codigos = input_df[col].astype(str).map(encoding_tables[col])
+            input_df[col] = codigos.where(input_df[col].notna()).fillna(UNKNOWN_CODE).astype(int)
+    return input_df
+
+def prepare_features(records):
+    """
+    Convierte una lista de casos (diccionarios) o un DataFrame de casos crudos en la
+    matriz de entrada de los modelos de severidad y brote. Se usa tanto en
+    predicciones por lotes como en la exportación; el DataFrame recibido no se modifica.
+    Los campos categóricos ausentes o nulos se codifican como UNKNOWN_CODE (el
+    código 0 es una clase real) y los numéricos ausentes o nulos, como 0.
+    """
+    input_df = records.copy() if isinstance(records, pd.DataFrame) else pd.DataFrame(records)
+    input_df = encode_categorical(input_df)
+    # to_numpy puede devolver una vista de solo lectura (p. ej. sin columnas); se copia solo en ese caso
+    X = np.require(input_df.reindex(columns=feature_columns).to_numpy(dtype=np.float32), requirements='W')
+
+    faltantes = np.isnan(X)
+    categoricas = np.array([col in encoding_tables for col in feature_columns], dtype=bool)
+    X[faltantes & categoricas] = UNKNOWN_CODE
+    X[faltantes & ~categoricas] = 0
+    return X
+
+def encode_record(record, out=None):
+    """
+    Codifica un único caso (diccionario) directamente en una fila float32 con el
+    orden de feature_columns, sin construir un DataFrame. Produce la misma fila que
+    prepare_features, con la misma política para campos ausentes o nulos.
+    Si se pasa out, la fila se escribe en ese arreglo.
+    """
+    row = np.empty(len(feature_columns), dtype=np.float32) if out is None else out
+    for j, col in enumerate(feature_columns):
+        value = record.get(col)
+        if col in encoding_tables:
+            row[j] = UNKNOWN_CODE if value is None else encoding_tables[col].get(str(value), UNKNOWN_CODE)
+        else:
+            row[j] = 0 if value is None else value
+    return row
+
+def unknown_fields(X):
+    """
+    Retorna, por cada fila de la matriz de entrada, la lista de columnas
+    categóricas ausentes o con un valor no visto durante el entrenamiento
+    (codificadas como UNKNOWN_CODE).
+    """
+    indices = [j for j, col in enumerate(feature_columns) if col in encoding_tables]
+    desconocidos = X[:, indices] == UNKNOWN_CODE
+    return [[feature_columns[indices[k]] for k in np.flatnonzero(fila)] for fila in desconocidos]
+
+# --- MATRICES DE ENTRENAMIENTO COMPARTIDAS ---
+def build_training_matrices(df, nombres=('severity', 'outbreak', 'trend')):
+    """
+    Construye una sola vez las matrices codificadas (X, y) de cada modelo.
+    X es una única matriz float32 compartida por los modelos de severidad y
+    brote, llenada columna a columna para no duplicar el DataFrame; las
+    etiquetas se guardan como enteros compactos (índices de clase, sin one-hot).
+    """
+    matrices = {}
+    if 'severity' in nombres or 'outbreak' in nombres:
+        X = np.empty((len(df), len(feature_columns)), dtype=np.float32)
+        for j, col in enumerate(feature_columns):
+            X[:, j] = df[col].to_numpy()
+    if 'severity' in nombres:
+        matrices['severity'] = (X, df['diagnostic_label'].to_numpy())
+    if 'outbreak' in nombres:
+        matrices['outbreak'] = (X, df['outbreak_label'].to_numpy())
+    if 'trend' in nombres:
+        # Agrupa por semana y distrito para contar los casos
+        # 'distrito' ya contiene los códigos asignados en load_data
+        df_trend = df.groupby(['distrito', 'semana']).size().reset_index(name='casos')
+        matrices['trend'] = (
+            df_trend[['distrito', 'semana']].to_numpy(dtype=np.float32),
+            df_trend['casos'].to_numpy(dtype=np.float32),
+        )
+    return matrices
+
+def split_indices(n_filas, test_size=VALIDATION_SPLIT):
+    """
+    Divide las filas en entrenamiento y validación mediante índices, sin copiar las matrices.
+    """
+    indices = np.random.permutation(n_filas)
+    n_test = int(np.ceil(n_filas * test_size))
+    return indices[n_test:], indices[:n_test]
+
+def batch_dataset(X, y, indices, batch_size=TRAINING_BATCH_SIZE, shuffle=True):
+    """
+    tf.data.Dataset que entrega lotes (X[lote], y[lote]) leídos por índice.
+    Solo se materializa un lote a la vez, de modo que X puede ser un np.memmap
+    mayor que la memoria disponible.
+    """
+    def generator():
+        orden = np.random.permutation(indices) if shuffle else indices
+        for inicio in range(0, len(orden), batch_size):
+            # Índices ordenados para leer de forma secuencial (útil con memmap)
+            lote = np.sort(orden[inicio:inicio + batch_size])
+            yield np.asarray(X[lote], dtype=np.float32), np.asarray(y[lote])
+
+    signature = (
+        tf.TensorSpec(shape=(None, X.shape[1]), dtype=tf.float32),
+        tf.TensorSpec(shape=(None,), dtype=tf.as_dtype(y.dtype)),
+    )
+    return tf.data.Dataset.from_generator(generator, output_signature=signature).prefetch(tf.data.AUTOTUNE)
+
+def _fit(model, X, y):
+    """Entrena un modelo compilado con una división por índices y lotes de tf.data."""
+    train_idx, test_idx = split_indices(len(X))
+    model.fit(
+        batch_dataset(X, y, train_idx),
+        epochs=TRAINING_EPOCHS,
+        verbose=0,
+        validation_data=batch_dataset(X, y, test_idx, shuffle=False),
+    )
+    return model
+
 # --- PREDICCIÓN 1: SEVERIDAD DEL DIAGNÓSTICO (CLASIFICACIÓN MULTICLASE) ---
-def train_severity_model(df):
+def fit_severity_model(X, y):
     """
-    Entrena un modelo para predecir la severidad del diagnóstico.
+    Entrena el modelo de severidad a partir de las matrices ya codificadas.
     """
-    global one_hot_encoder
-    y = pd.get_dummies(df['diagnostic_label'])
-    
-    X = df.drop(['diagnostic', 'diagnostic_label'], axis=1)
-    
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2)
-    
+    n_clases = int(y.max()) + 1
     model = keras.Sequential([
         keras.layers.Input(shape=(X.shape[1],)),
         keras.layers.Dense(128, activation='relu'),
         keras.layers.Dense(64, activation='relu'),
-        keras.layers.Dense(y.shape[1], activation='softmax')
+        keras.layers.Dense(n_clases, activation='softmax')
     ])
     
-    model.compile(optimizer='adam', loss='categorical_crossentropy', metrics=['accuracy'])
-    model.fit(X_train, y_train, epochs=10, batch_size=32, verbose=0, validation_data=(X_test, y_test))
-    return model
+    # Etiquetas como índices de clase: evita materializar la matriz one-hot
+    model.compile(optimizer='adam', loss='sparse_categorical_crossentropy', metrics=['accuracy'])
+    return _fit(model, X, y)
 
-def predict_diagnosis_severity(model, input_data, df):
+def train_severity_model(df):
     """
-    Hace una predicción de la severidad del diagnóstico.
+    Entrena un modelo para predecir la severidad del diagnóstico.
     """
-    try:
-        input_df = pd.DataFrame([input_data])
-        for col in input_df.columns:
-            if col in label_encoders and col in ['departamento', 'provincia', 'distrito', 'enfermedad', 'tipo_dx', 'diresa', 'tipo_edad', 'sexo']:
-                input_df[col] = label_encoders[col].transform(input_df[col].astype(str))
+    return fit_severity_model(*build_training_matrices(df, ('severity',))['severity'])
 
-        columnas_entrenamiento = df.drop(['diagnostic', 'diagnostic_label'], axis=1).columns
-        input_df = input_df.reindex(columns=columnas_entrenamiento, fill_value=0)
-        
-        prediccion_probabilidades = model.predict(input_df, verbose=0)
-        prediccion_clase_index = prediccion_probabilidades.argmax(axis=1)[0]
-        clase_predicha = diagnosticos_clases[prediccion_clase_index]
-        
-        return f"Clase predicha: {clase_predicha} (con una probabilidad de {prediccion_probabilidades[0][prediccion_clase_index]*100:.2f}%)"
-    except Exception as e:
-        return f"Error en la predicción: {str(e)}"
+def _severity_results(model, X):
+    probabilidades = model.predict(X, batch_size=1024, verbose=0)
+    indices = probabilidades.argmax(axis=1)
+    return [
+        {
+            "clase_index": int(indice),
+            "clase": str(diagnosticos_clases[indice]),
+            "probabilidad": float(fila[indice]),
+            "probabilidades": fila.tolist(),
+            "campos_desconocidos": campos,
+        }
+        for indice, fila, campos in zip(indices, probabilidades, unknown_fields(X))
+    ]
+
+def predict_severity_batch(model, records):
+    """
+    Predice la severidad del diagnóstico para una lista de casos en una sola pasada.
+    Retorna un diccionario por caso con la clase, su probabilidad, el vector completo
+    y los campos categóricos no vistos en el entrenamiento.
+    """
+    return _severity_results(model, prepare_features(records))
+
+def predict_diagnosis_severity(model, input_data):
+    """
+    Hace una predicción de la severidad del diagnóstico.
+    """
+    return _severity_results(model, encode_record(input_data)[None, :])[0]
 
 # --- PREDICCIÓN 2: RIESGO DE BROTE (CLASIFICACIÓN BINARIA) ---
-def train_outbreak_model(df):
+def fit_outbreak_model(X, y):
     """
-    Entrena un modelo para predecir si un caso es positivo o negativo.
+    Entrena el modelo de riesgo de brote a partir de las matrices ya codificadas.
     """
-    X = df.drop(['diagnostic', 'diagnostic_label'], axis=1)
-    # Define la etiqueta: es un caso positivo (>0) o no
-    y = (df['diagnostic'] > 0).astype(int)
-    
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2)
-    
     model = keras.Sequential([
         keras.layers.Input(shape=(X.shape[1],)),
         keras.layers.Dense(64, activation='relu'),
@@ -102,43 +275,48 @@ def train_outbreak_model(df):
     ])
     
     model.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy'])
-    model.fit(X_train, y_train, epochs=10, batch_size=32, verbose=0, validation_data=(X_test, y_test))
-    return model
+    return _fit(model, X, y)
+
+def train_outbreak_model(df):
+    """
+    Entrena un modelo para predecir si un caso es positivo o negativo.
+    """
+    return fit_outbreak_model(*build_training_matrices(df, ('outbreak',))['outbreak'])
+
+# Etiquetas del modelo de brote, indexadas por clase
+OUTBREAK_CLASSES = ['Negative', 'Positive']
+
+def _outbreak_results(model, X):
+    probabilidades = model.predict(X, batch_size=1024, verbose=0)[:, 0]
+    resultados = []
+    for probabilidad, campos in zip(probabilidades, unknown_fields(X)):
+        indice = int(probabilidad > 0.5)
+        resultados.append({
+            "clase_index": indice,
+            "clase": OUTBREAK_CLASSES[indice],
+            "probabilidad": float(probabilidad),
+            "probabilidades": [1.0 - float(probabilidad), float(probabilidad)],
+            "campos_desconocidos": campos,
+        })
+    return resultados
 
-def predict_outbreak_risk(model, input_data, df):
+def predict_outbreak_batch(model, records):
+    """
+    Predice el riesgo de brote para una lista de casos en una sola pasada.
+    """
+    return _outbreak_results(model, prepare_features(records))
+
+def predict_outbreak_risk(model, input_data):
     """
     Hace una predicción del riesgo de brote (positivo o negativo).
     """
-    try:
-        input_df = pd.DataFrame([input_data])
-        for col in input_df.columns:
-            if col in label_encoders and col in ['departamento', 'provincia', 'distrito', 'enfermedad', 'tipo_dx', 'diresa', 'tipo_edad', 'sexo']:
-                input_df[col] = label_encoders[col].transform(input_df[col].astype(str))
-        
-        columnas_entrenamiento = df.drop(['diagnostic', 'diagnostic_label'], axis=1).columns
-        input_df = input_df.reindex(columns=columnas_entrenamiento, fill_value=0)
-        
-        prediccion = model.predict(input_df, verbose=0)[0][0]
-        
-        return f"El resultado de la predicción es: {'Positive' if prediccion > 0.5 else 'Negative'} (Probabilidad: {prediccion*100:.2f}%)"
-    except Exception as e:
-        return f"Error en la predicción: {str(e)}"
+    return _outbreak_results(model, encode_record(input_data)[None, :])[0]
 
 # --- PREDICCIÓN 3: ANÁLISIS DE TENDENCIAS A CORTO PLAZO (REGRESIÓN) ---
-def train_trend_model(df):
+def fit_trend_model(X, y):
     """
-    Entrena un modelo para predecir el número de casos.
+    Entrena el modelo de tendencia a partir de las matrices (distrito, semana) -> casos.
     """
-    # Agrupa por semana y distrito para contar los casos
-    df_trend = df.groupby(['distrito', 'semana']).size().reset_index(name='casos')
-    df_trend['distrito'] = label_encoders['distrito'].transform(df_trend['distrito'].astype(str))
-    
-    # Define X e Y para la regresión
-    X = df_trend[['distrito', 'semana']]
-    y = df_trend['casos']
-    
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2)
-    
     model = keras.Sequential([
         keras.layers.Input(shape=(X.shape[1],)),
         keras.layers.Dense(64, activation='relu'),
@@ -147,21 +325,104 @@ def train_trend_model(df):
     ])
     
     model.compile(optimizer='adam', loss='mean_squared_error')
-    model.fit(X_train, y_train, epochs=10, batch_size=32, verbose=0, validation_data=(X_test, y_test))
-    return model
+    return _fit(model, X, y)
+
+def train_trend_model(df):
+    """
+    Entrena un modelo para predecir el número de casos.
+    """
+    return fit_trend_model(*build_training_matrices(df, ('trend',))['trend'])
+
+# Funciones de entrenamiento por modelo, usadas por el orquestador de entrenamiento
+MODEL_FITTERS = {
+    'severity': fit_severity_model,
+    'outbreak': fit_outbreak_model,
+    'trend': fit_trend_model,
+}
+
+def precompute_trend_grid(model, df):
+    """
+    Calcula en una sola pasada la predicción de casos para todas las
+    combinaciones distrito × semana, de modo que las consultas sean O(1).
+    """
+    global trend_grid
+    n_distritos = len(encoding_tables['distrito'])
+    semanas = np.arange(int(df['semana'].max()) + 1)
+
+    distritos_rejilla, semanas_rejilla = np.meshgrid(np.arange(n_distritos), semanas, indexing='ij')
+    X = np.column_stack([distritos_rejilla.ravel(), semanas_rejilla.ravel()]).astype(np.float32)
+
+    predicciones = model.predict(X, batch_size=4096, verbose=0)[:, 0]
+    trend_grid = predicciones.reshape(n_distritos, len(semanas)).astype(np.float32)
+    return trend_grid
+
+def parse_week(value):
+    """
+    Valida una semana epidemiológica y la retorna como entero. Acepta 36, 36.0 o "36";
+    lanza ValueError para valores no enteros (3.7), nulos o fuera de rango.
+    """
+    try:
+        numero = float(value) if not isinstance(value, bool) else float("nan")
+    except (TypeError, ValueError):
+        numero = float("nan")
+    if not numero.is_integer() or not EPI_WEEK_MIN <= numero <= EPI_WEEK_MAX:
+        raise ValueError(f"Semana inválida '{value}': debe ser un entero entre {EPI_WEEK_MIN} y {EPI_WEEK_MAX}")
+    return int(numero)
+
+def predict_trend_batch(model, records):
+    """
+    Predice el número de casos para una lista de pares (distrito, semana).
+    Usa la rejilla precalculada cuando la semana está dentro de su rango.
+    Lanza ValueError si alguna semana no es válida o algún distrito no se vio
+    durante el entrenamiento.
+    """
+    semanas = np.array([parse_week(r['semana']) for r in records], dtype=np.int64)
+    codigos = np.array([encode_value('distrito', r['distrito']) for r in records], dtype=np.int64)
+
+    desconocidos = codigos == UNKNOWN_CODE
+    if desconocidos.any():
+        distrito = records[int(np.argmax(desconocidos))]['distrito']
+        raise ValueError(f"Distrito desconocido '{distrito}'")
+
+    casos = np.empty(len(records), dtype=np.float32)
+    en_rejilla = np.zeros(len(records), dtype=bool)
+    if trend_grid is not None:
+        en_rejilla = (semanas >= 0) & (semanas < trend_grid.shape[1])
+        casos[en_rejilla] = trend_grid[codigos[en_rejilla], semanas[en_rejilla]]
+    if not en_rejilla.all():
+        X = np.column_stack([codigos[~en_rejilla], semanas[~en_rejilla]]).astype(np.float32)
+        casos[~en_rejilla] = model.predict(X, verbose=0)[:, 0]
+
+    return [
+        {
+            "distrito": str(r['distrito']),
+            "distrito_codigo": int(codigo),
+            "semana": int(semana),
+            "casos_esperados": float(valor),
+            "casos": int(round(float(valor))),
+        }
+        for r, codigo, semana, valor in zip(records, codigos, semanas, casos)
+    ]
 
 def predict_case_count(model, input_data):
     """
     Hace una predicción del número de casos.
     """
-    try:
-        distrito_codificado = label_encoders['distrito'].transform([input_data['distrito']])[0]
-        input_df = pd.DataFrame([{'distrito': distrito_codificado, 'semana': input_data['semana']}])
-        
-        prediccion = model.predict(input_df, verbose=0)[0][0]
-        return f"Se esperan {int(round(prediccion))} casos en el distrito '{input_data['distrito']}' en la semana {input_data['semana']}."
-    except Exception as e:
-        return f"Error en la predicción: {str(e)}"
+    return predict_trend_batch(model, [input_data])[0]
+
+# Predictores de un solo caso indexados por tipo de predicción
+PREDICTORS = {
+    'severity': predict_diagnosis_severity,
+    'outbreak': predict_outbreak_risk,
+    'trend': predict_case_count,
+}
+
+# Predictores por lotes indexados por tipo de predicción
+BATCH_PREDICTORS = {
+    'severity': predict_severity_batch,
+    'outbreak': predict_outbreak_batch,
+    'trend': predict_trend_batch,
+}
 
 # --- Código principal que ejecuta las predicciones ---
 if __name__ == "__main__":
@@ -206,13 +467,41 @@ if __name__ == "__main__":
 
         # --- Prueba de las 3 predicciones ---
         print("\n--- Resultado de la Predicción de Severidad ---")
-        resultado_severidad = predict_diagnosis_severity(modelo_severidad, datos_entrada_caso, df)
+        resultado_severidad = predict_diagnosis_severity(modelo_severidad, datos_entrada_caso)
         print(resultado_severidad)
 
         print("\n--- Resultado de la Predicción de Riesgo ---")
-        resultado_riesgo = predict_outbreak_risk(modelo_brote, datos_entrada_caso, df)
+        resultado_riesgo = predict_outbreak_risk(modelo_brote, datos_entrada_caso)
         print(resultado_riesgo)
 
         print("\n--- Resultado de la Predicción de Tendencia ---")
         resultado_tendencia = predict_case_count(modelo_tendencia, datos_entrada_tendencia)
-        print(resultado_tendencia)
\ No newline at end of file
+        print(resultado_tendencia)
+
+        # --- Medición del paso de codificación categórica ---
+        repeticiones = 10000
+        filas = [datos_entrada_caso] * repeticiones
+        inicio = time.perf_counter()
+        prepare_features(filas)
+        duracion = time.perf_counter() - inicio
+        print(f"\nCodificación por lotes: {duracion / repeticiones * 1e6:.2f} µs por fila ({repeticiones} filas)")
+
+        # Ruta de una sola petición: fila codificada desde el diccionario frente a un DataFrame de una fila
+        fila = np.empty(len(feature_columns), dtype=np.float32)
+        inicio = time.perf_counter()
+        for _ in range(1000):
+            encode_record(datos_entrada_caso, out=fila)
+        duracion = time.perf_counter() - inicio
+        print(f"Codificación de un caso (encode_record): {duracion / 1000 * 1e6:.2f} µs")
+
+        inicio = time.perf_counter()
+        for _ in range(1000):
+            prepare_features([datos_entrada_caso])
+        duracion = time.perf_counter() - inicio
+        print(f"Codificación de un caso (DataFrame de una fila): {duracion / 1000 * 1e6:.2f} µs")
+
+        inicio = time.perf_counter()
+        for _ in range(1000):
+            encode_value('distrito', datos_entrada_caso['distrito'])
+        duracion = time.perf_counter() - inicio
+        print(f"Codificación de un valor: {duracion / 1000 * 1e6:.2f} µs")
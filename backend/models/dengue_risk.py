@@ -0,0 +1,114 @@
+import numpy as np
+
+from . import dengue_prediction
+
+# Perfil representativo de cada distrito, calculado tras el entrenamiento
+district_profiles = None
+
+
+class DistrictProfiles:
+    """
+    Matriz de características representativa por distrito (moda de las
+    columnas categóricas, mediana de las numéricas), en el orden de
+    dengue_prediction.feature_columns.
+    """
+
+    def __init__(self, codes, features):
+        self.codes = codes
+        self.features = features
+
+
+class RiskMap:
+    """
+    Resultado compacto del motor de riesgo: arreglos paralelos ordenados por
+    probabilidad descendente.
+    """
+
+    def __init__(self, codes, probabilities, expected_cases):
+        self.codes = codes
+        self.probabilities = probabilities
+        self.expected_cases = expected_cases
+
+    def __len__(self):
+        return len(self.codes)
+
+    def filter(self, min_probability):
+        mask = self.probabilities >= min_probability
+        return RiskMap(self.codes[mask], self.probabilities[mask], self.expected_cases[mask])
+
+    def page(self, offset, limit):
+        """Convierte una porción del resultado en filas serializables."""
+        nombres = dengue_prediction.label_encoders['distrito'].classes_
+        fin = min(offset + limit, len(self.codes))
+        return [
+            {
+                "distrito_codigo": int(self.codes[i]),
+                "distrito": str(nombres[self.codes[i]]),
+                "probabilidad": round(float(self.probabilities[i]), 4),
+                "casos_esperados": round(float(self.expected_cases[i]), 2),
+            }
+            for i in range(offset, fin)
+        ]
+
+
+def build_district_profiles(df):
+    """
+    Calcula una fila de características representativa por distrito a partir
+    de los datos ya preprocesados.
+    """
+    global district_profiles
+    columnas = dengue_prediction.feature_columns
+    categoricas = [c for c in columnas if c in dengue_prediction.CATEGORICAL_COLUMNS and c != 'distrito']
+    numericas = [c for c in columnas if c not in categoricas and c != 'distrito']
+
+    agrupado = df.groupby('distrito')
+    perfiles = agrupado[numericas].median()
+    for col in categoricas:
+        perfiles[col] = agrupado[col].agg(lambda s: s.value_counts().idxmax())
+    perfiles['distrito'] = perfiles.index
+
+    district_profiles = DistrictProfiles(
+        codes=perfiles.index.to_numpy(dtype=np.int32),
+        features=perfiles[columnas].to_numpy(dtype=np.float32),
+    )
+    return district_profiles
+
+
+def score_districts(outbreak_model, trend_model, ano, semana_inicio, semana_fin):
+    """
+    Evalúa todos los distritos para un rango de semanas en una sola pasada.
+    Por distrito retorna la probabilidad máxima de caso positivo en el rango
+    y la suma de casos esperados.
+    """
+    if district_profiles is None:
+        raise RuntimeError("Los perfiles de distrito no se han calculado")
+
+    columnas = dengue_prediction.feature_columns
+    semanas = np.arange(semana_inicio, semana_fin + 1)
+    n_distritos, n_semanas = len(district_profiles.codes), len(semanas)
+
+    # Una fila por combinación distrito × semana
+    X = np.repeat(district_profiles.features, n_semanas, axis=0)
+    semanas_filas = np.tile(semanas, n_distritos)
+    if 'ano' in columnas:
+        X[:, columnas.index('ano')] = ano
+    if 'semana' in columnas:
+        X[:, columnas.index('semana')] = semanas_filas
+
+    probabilidades = outbreak_model.predict(X, batch_size=4096, verbose=0)[:, 0]
+    probabilidades = probabilidades.reshape(n_distritos, n_semanas).max(axis=1)
+
+    rejilla = dengue_prediction.trend_grid
+    if rejilla is not None and semana_fin < rejilla.shape[1]:
+        casos = rejilla[district_profiles.codes][:, semanas].sum(axis=1)
+    else:
+        X_trend = np.column_stack([np.repeat(district_profiles.codes, n_semanas), semanas_filas]).astype(np.float32)
+        casos = trend_model.predict(X_trend, batch_size=4096, verbose=0)[:, 0]
+        casos = casos.reshape(n_distritos, n_semanas).sum(axis=1)
+
+    orden = np.argsort(-probabilidades, kind='stable')
+    return RiskMap(
+        codes=district_profiles.codes[orden],
+        probabilities=probabilidades[orden].astype(np.float32),
+        expected_cases=casos[orden].astype(np.float32),
+    )
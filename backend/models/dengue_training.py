@@ -0,0 +1,116 @@
+import os
+import time
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from . import dengue_prediction
+
+# Permite desactivar el entrenamiento en paralelo (por ejemplo, en equipos con pocos núcleos)
+PARALLEL_TRAINING = os.getenv("DENGUE_PARALLEL_TRAINING", "1") != "0"
+
+
+def _threads_per_process(n_procesos):
+    configurado = os.getenv("DENGUE_TRAINING_THREADS")
+    if configurado:
+        return int(configurado)
+    return max(1, (os.cpu_count() or 1) // n_procesos)
+
+
+def _limit_threads(hilos):
+    """
+    Limita los hilos de cómputo del proceso actual. Debe ejecutarse antes de
+    que TensorFlow cree su contexto (es decir, antes del primer entrenamiento).
+    """
+    for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[variable] = str(hilos)
+
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(hilos)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+
+def _train_worker(nombre, X_path, y_path):
+    """
+    Entrena un modelo en un proceso hijo y lo devuelve serializado
+    (arquitectura JSON + pesos), ya que los modelos Keras no se pueden
+    enviar entre procesos directamente. Las matrices se abren como memmap de
+    solo lectura, de modo que los procesos comparten las páginas en lugar de
+    recibir cada uno una copia.
+    """
+    inicio = time.perf_counter()
+    X = np.load(X_path, mmap_mode='r')
+    y = np.load(y_path, mmap_mode='r')
+    model = dengue_prediction.MODEL_FITTERS[nombre](X, y)
+    return model.to_json(), model.get_weights(), time.perf_counter() - inicio
+
+
+def _save_matrices(matrices, directorio):
+    """
+    Guarda cada matriz distinta una sola vez como .npy (X es compartida por
+    severidad y brote) y retorna {nombre: (ruta_X, ruta_y)}.
+    """
+    rutas_por_id = {}
+    rutas = {}
+    for nombre, (X, y) in matrices.items():
+        par = []
+        for sufijo, matriz in (("X", X), ("y", y)):
+            if id(matriz) not in rutas_por_id:
+                ruta = os.path.join(directorio, f"{nombre}_{sufijo}.npy")
+                np.save(ruta, matriz)
+                rutas_por_id[id(matriz)] = ruta
+            par.append(rutas_por_id[id(matriz)])
+        rutas[nombre] = tuple(par)
+    return rutas
+
+
+def _rebuild_model(model_json, weights):
+    model = dengue_prediction.keras.models.model_from_json(model_json)
+    model.set_weights(weights)
+    return model
+
+
+def train_all_models(df, parallel=None):
+    """
+    Construye una sola vez las matrices de entrenamiento y entrena los tres
+    modelos de dengue, en procesos separados si el paralelismo está activado.
+    Retorna (modelos, tiempos), con los tiempos en segundos por modelo y el total.
+    """
+    parallel = PARALLEL_TRAINING if parallel is None else parallel
+    inicio_total = time.perf_counter()
+
+    inicio = time.perf_counter()
+    matrices = dengue_prediction.build_training_matrices(df)
+    tiempos = {"matrices": time.perf_counter() - inicio}
+    models = {}
+
+    if parallel:
+        hilos = _threads_per_process(len(matrices))
+        print(f"Entrenando {len(matrices)} modelos en paralelo ({hilos} hilos por proceso)...")
+        # 'spawn' evita heredar el estado de TensorFlow del proceso padre
+        contexto = multiprocessing.get_context("spawn")
+        with tempfile.TemporaryDirectory(prefix="dengue_training_") as directorio, \
+                ProcessPoolExecutor(max_workers=len(matrices), mp_context=contexto,
+                                    initializer=_limit_threads, initargs=(hilos,)) as executor:
+            rutas = _save_matrices(matrices, directorio)
+            # Los procesos leen las matrices del disco; el padre ya no necesita conservarlas
+            matrices.clear()
+            futuros = {
+                nombre: executor.submit(_train_worker, nombre, X_path, y_path)
+                for nombre, (X_path, y_path) in rutas.items()
+            }
+            for nombre, futuro in futuros.items():
+                model_json, weights, duracion = futuro.result()
+                models[nombre] = _rebuild_model(model_json, weights)
+                tiempos[nombre] = duracion
+    else:
+        for nombre, (X, y) in matrices.items():
+            inicio = time.perf_counter()
+            models[nombre] = dengue_prediction.MODEL_FITTERS[nombre](X, y)
+            tiempos[nombre] = time.perf_counter() - inicio
+
+    tiempos["total"] = time.perf_counter() - inicio_total
+    print("Tiempos de entrenamiento: " + ", ".join(f"{k}={v:.2f}s" for k, v in tiempos.items()))
+    return models, tiempos
@@ -0,0 +1,183 @@
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, Optional
+
+# Endpoints muestreados por defecto
+DEFAULT_ENDPOINTS = ("/login", "/dengue/predict")
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    name = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    return name.replace(";", ":")
+
+
+class SamplingProfiler:
+    """
+    Perfilador estadístico para endpoints seleccionados.
+
+    Mientras haya solicitudes muestreadas en curso, un hilo toma cada
+    `interval` segundos la pila del hilo que atiende cada solicitud
+    (sys._current_frames) y acumula las pilas colapsadas por endpoint.
+    Los endpoints async comparten el hilo del event loop, por lo que una
+    muestra se atribuye a todas las solicitudes muestreadas activas en ese hilo.
+
+    Desactivado, ProfilingMiddleware solo comprueba `enabled` y pasa la
+    solicitud a la aplicación sin envolverla.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.sample_rate = 1.0
+        self.interval = 0.005
+        self.endpoints = set(DEFAULT_ENDPOINTS)
+        self.window_until: Optional[float] = None
+        self.stacks: Dict[str, Counter] = defaultdict(Counter)
+        self.sampled_requests: Counter = Counter()
+        self._active: Dict[int, tuple] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def configure(self, enabled: bool, sample_rate: float = 1.0, duration_seconds: Optional[float] = None,
+                  endpoints: Optional[Iterable[str]] = None, interval_ms: float = 5.0):
+        self.sample_rate = sample_rate
+        self.interval = interval_ms / 1000.0
+        if endpoints:
+            self.endpoints = set(endpoints)
+        self.window_until = time.monotonic() + duration_seconds if duration_seconds else None
+        self.enabled = enabled
+
+    def reset(self):
+        with self._lock:
+            self.stacks = defaultdict(Counter)
+            self.sampled_requests = Counter()
+
+    def should_sample(self, path: str) -> bool:
+        if path not in self.endpoints:
+            return False
+        if self.window_until is not None and time.monotonic() > self.window_until:
+            self.enabled = False
+            return False
+        return random.random() < self.sample_rate
+
+    def begin(self, endpoint: str) -> int:
+        token = next(self._ids)
+        with self._lock:
+            self._active[token] = (threading.get_ident(), endpoint)
+            self.sampled_requests[endpoint] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+                self._thread.start()
+        return token
+
+    def end(self, token: int):
+        with self._lock:
+            self._active.pop(token, None)
+
+    def _run(self):
+        own_thread = threading.get_ident()
+        while True:
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+                active = list(self._active.values())
+
+            frames = sys._current_frames()
+            samples = []
+            for thread_id, endpoint in active:
+                frame = frames.get(thread_id)
+                if frame is None or thread_id == own_thread:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                samples.append((endpoint, ";".join(reversed(stack))))
+            del frames
+
+            with self._lock:
+                for endpoint, stack in samples:
+                    self.stacks[endpoint][stack] += 1
+            time.sleep(self.interval)
+
+    def _snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {endpoint: dict(stacks) for endpoint, stacks in self.stacks.items()}
+
+    def status(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "interval_ms": self.interval * 1000.0,
+            "endpoints": sorted(self.endpoints),
+            "window_remaining_seconds": max(0.0, self.window_until - time.monotonic()) if self.window_until else None,
+            "sampled_requests": dict(self.sampled_requests),
+            "samples": {endpoint: sum(stacks.values()) for endpoint, stacks in self._snapshot().items()},
+        }
+
+    def collapsed(self, endpoint: Optional[str] = None) -> str:
+        """Pilas en formato colapsado (flamegraph.pl / speedscope): 'a;b;c cuenta'."""
+        lines = []
+        for name, stacks in self._snapshot().items():
+            if endpoint is not None and name != endpoint:
+                continue
+            prefix = "" if endpoint is not None else f"{name};"
+            lines.extend(f"{prefix}{stack} {count}" for stack, count in stacks.items())
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self, endpoint: Optional[str] = None) -> dict:
+        """Perfil en formato de archivo speedscope, con un perfil por endpoint."""
+        frame_index: Dict[str, int] = {}
+        profiles = []
+        for name, stacks in self._snapshot().items():
+            if endpoint is not None and name != endpoint:
+                continue
+            samples, weights = [], []
+            for stack, count in stacks.items():
+                samples.append([frame_index.setdefault(label, len(frame_index)) for label in stack.split(";")])
+                weights.append(count * self.interval * 1000.0)
+            profiles.append({
+                "type": "sampled",
+                "name": name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            })
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": "pryDengue",
+            "shared": {"frames": [{"name": label} for label in frame_index]},
+            "profiles": profiles,
+        }
+
+
+profiler = SamplingProfiler()
+
+
+class ProfilingMiddleware:
+    """
+    Middleware ASGI puro. Con el perfilador desactivado delega directamente
+    en la aplicación, sin envolver la solicitud ni la respuesta.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if not profiler.enabled or scope["type"] != "http" or not profiler.should_sample(scope["path"]):
+            return await self.app(scope, receive, send)
+
+        token = profiler.begin(scope["path"])
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.end(token)
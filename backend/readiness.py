@@ -0,0 +1,105 @@
+import threading
+import time
+import traceback
+from typing import Callable, Dict, Optional
+
+from fastapi import HTTPException
+
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+# Segundos sugeridos al cliente en Retry-After mientras un componente se carga
+RETRY_AFTER_SECONDS = 10
+
+
+class Component:
+    """Estado de carga de un componente del servidor (modelo, galería, etc.)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.status = PENDING
+        self.started_at: Optional[float] = None
+        self.duration: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        duration = self.duration
+        if self.status == LOADING and self.started_at is not None:
+            duration = time.monotonic() - self.started_at
+        return {
+            "status": self.status,
+            "load_seconds": round(duration, 3) if duration is not None else None,
+            "error": self.error,
+        }
+
+
+_components: Dict[str, Component] = {}
+_lock = threading.Lock()
+
+
+def register(name: str) -> Component:
+    with _lock:
+        if name not in _components:
+            _components[name] = Component(name)
+        return _components[name]
+
+
+def is_ready(name: str) -> bool:
+    component = _components.get(name)
+    return component is not None and component.status == READY
+
+
+def snapshot() -> dict:
+    with _lock:
+        return {name: component.to_dict() for name, component in _components.items()}
+
+
+def all_ready() -> bool:
+    with _lock:
+        return bool(_components) and all(c.status == READY for c in _components.values())
+
+
+def run_component(name: str, loader: Callable[[], None]):
+    """Ejecuta el cargador de un componente registrando su estado y duración."""
+    component = register(name)
+    component.status = LOADING
+    component.error = None
+    component.started_at = time.monotonic()
+    try:
+        loader()
+        component.status = READY
+        print(f"Componente '{name}' listo en {time.monotonic() - component.started_at:.2f}s")
+    except Exception as e:
+        component.status = FAILED
+        component.error = str(e)
+        print(f"Error cargando el componente '{name}': {e}")
+        print(f"Full traceback: {traceback.format_exc()}")
+    finally:
+        component.duration = time.monotonic() - component.started_at
+
+
+def start_background(name: str, loader: Callable[[], None]) -> threading.Thread:
+    """Lanza la carga de un componente en un hilo en segundo plano."""
+    register(name)
+    thread = threading.Thread(target=run_component, args=(name, loader), name=f"load-{name}", daemon=True)
+    thread.start()
+    return thread
+
+
+def require_ready(name: str):
+    """
+    Lanza 503 con Retry-After si el componente aún se está cargando,
+    o 500 si su carga falló.
+    """
+    component = _components.get(name)
+    if component is not None and component.status == READY:
+        return
+    if component is not None and component.status == FAILED:
+        raise HTTPException(status_code=500, detail=f"El componente '{name}' no se pudo cargar: {component.error}")
+    raise HTTPException(
+        status_code=503,
+        detail=f"El componente '{name}' aún se está cargando, intente nuevamente en unos segundos",
+        headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+    )
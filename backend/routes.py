@@ -1,11 +1,23 @@
-from fastapi import APIRouter, HTTPException, Depends
-from .login import database, face_utils, auth, models
-from .login.schemas import RegisterRequest, LoginRequest, LoginResponse, MetricsResponse, AdminSetupRequest
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+from .login import database, face_utils, auth, models, rate_limit
+from .login.schemas import RegisterRequest, LoginRequest, LoginResponse, MetricsResponse, AdminSetupRequest, ProfilingConfigRequest
+from . import readiness
+from .profiling import profiler
+from typing import List, Literal, Optional
 import traceback
 
 router = APIRouter()
 
+# Nombre del componente en el registro de disponibilidad
+GALLERY_COMPONENT = "facial_gallery"
+readiness.register(GALLERY_COMPONENT)
+
+def load_gallery():
+    """Carga la galería de embeddings y entrena el modelo facial al iniciar el servidor"""
+    models.model.load_data()
+    models.model.train()
+
 @router.post("/setup-admin")
 async def setup_admin(request: AdminSetupRequest):
     """Configura el embedding del admin por primera vez"""
@@ -50,6 +62,7 @@ async def setup_admin(request: AdminSetupRequest):
         print("Training model...")
         train_result = models.model.train()
         print(f"Training result: {train_result}")
+        rate_limit.rejected_embeddings.clear()
 
         print("Creating access token...")
         token = auth.create_access_token({"sub": "admin"})
@@ -66,9 +79,19 @@ async def setup_admin(request: AdminSetupRequest):
         raise HTTPException(status_code=500, detail=f"Error interno del servidor: {str(e)}")
 
 @router.post("/login", response_model=LoginResponse)
-async def login(request: LoginRequest):
+async def login(request: LoginRequest, http_request: Request):
+    client = http_request.client.host if http_request.client else "unknown"
+    if not rate_limit.login_limiter.allow(client):
+        rate_limit.shed_counters["rate_limited"] += 1
+        raise HTTPException(
+            status_code=429,
+            detail="Demasiados intentos de inicio de sesión, intente más tarde",
+            headers={"Retry-After": str(rate_limit.login_limiter.retry_after())},
+        )
+
     try:
         print(f"Login attempt with embedding length: {len(request.embedding)}")
+        readiness.require_ready(GALLERY_COMPONENT)
         
         if len(request.embedding) != 128:
             raise HTTPException(status_code=400, detail=f"Tamaño de embedding incorrecto: {len(request.embedding)}")
@@ -78,19 +101,27 @@ async def login(request: LoginRequest):
         if not face_utils.validate_embedding_size(normalized_embedding):
             raise HTTPException(status_code=400, detail="Tamaño de embedding inválido")
 
-        print("Loading model data before prediction...")
-        models.model.load_data()
-        
-        if len(models.model.embeddings) > 0:
-            print("Training model...")
-            models.model.train()
-        else:
+        # Usa la galería y el modelo preparados al iniciar y solo los recarga si la
+        # base de datos cambió desde entonces: otro worker de uvicorn pudo registrar
+        # usuarios, y las huellas rechazadas hasta ahora dejan de ser válidas
+        if models.model.is_stale():
+            print("User database changed since last load, reloading gallery")
+            load_gallery()
+            rate_limit.rejected_embeddings.clear()
+
+        # Un embedding idéntico a uno rechazado hace poco se rechaza sin ejecutar el modelo
+        fingerprint = rate_limit.embedding_fingerprint(normalized_embedding)
+        if rate_limit.is_recently_rejected(fingerprint):
+            raise HTTPException(status_code=401, detail="Autenticación fallida")
+
+        if len(models.model.embeddings) == 0:
             print("No embeddings loaded, cannot proceed with login")
             raise HTTPException(status_code=401, detail="Sistema no inicializado correctamente")
 
         user_name = models.model.predict(normalized_embedding)
 
         if not user_name:
+            rate_limit.remember_rejected(fingerprint)
             raise HTTPException(status_code=401, detail="Autenticación fallida")
 
         token = auth.create_access_token({"sub": user_name})
@@ -126,6 +157,8 @@ async def register(request: RegisterRequest, token: str = Depends(auth.get_curre
 
         models.model.load_data()
         models.model.train()
+        # Un embedding rechazado antes puede pertenecer al nuevo usuario
+        rate_limit.rejected_embeddings.clear()
 
         return {"message": "Usuario registrado exitosamente"}
 
@@ -177,4 +210,52 @@ async def get_metrics():
 
     except Exception as e:
         print(f"Metrics error: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error interno del servidor: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error interno del servidor: {str(e)}")
+
+@router.get("/login/shed-stats")
+async def get_login_shed_stats():
+    """Contadores de intentos de login descartados por el limitador o la caché de rechazos"""
+    return {
+        **rate_limit.shed_counters,
+        "rejected_cache": rate_limit.rejected_embeddings.stats(),
+    }
+
+@router.get("/admin/profiling")
+async def get_profiling_status(token: dict = Depends(auth.require_admin)):
+    """Estado del perfilador y número de muestras por endpoint"""
+    return profiler.status()
+
+@router.post("/admin/profiling")
+async def configure_profiling(request: ProfilingConfigRequest, token: dict = Depends(auth.require_admin)):
+    """Activa o desactiva el muestreo de los endpoints, opcionalmente por una ventana de tiempo"""
+    profiler.configure(
+        enabled=request.enabled,
+        sample_rate=request.sample_rate,
+        duration_seconds=request.duration_seconds,
+        endpoints=request.endpoints,
+        interval_ms=request.interval_ms,
+    )
+    return profiler.status()
+
+@router.delete("/admin/profiling")
+async def reset_profiling(token: dict = Depends(auth.require_admin)):
+    """Descarta las pilas acumuladas"""
+    profiler.reset()
+    return profiler.status()
+
+@router.get("/admin/profiling/download")
+async def download_profile(
+    format: Literal["collapsed", "speedscope"] = "speedscope",
+    endpoint: Optional[str] = None,
+    token: dict = Depends(auth.require_admin),
+):
+    """Descarga las pilas acumuladas en formato colapsado o speedscope"""
+    if format == "collapsed":
+        return PlainTextResponse(
+            profiler.collapsed(endpoint),
+            headers={"Content-Disposition": 'attachment; filename="profile.collapsed.txt"'},
+        )
+    return JSONResponse(
+        profiler.speedscope(endpoint),
+        headers={"Content-Disposition": 'attachment; filename="profile.speedscope.json"'},
+    )
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.models import dengue_prediction
+from backend.models.dengue_prediction import CATEGORICAL_COLUMNS, UNKNOWN_CODE
+
+
+@pytest.fixture(scope="module")
+def encoders(tmp_path_factory):
+    """Ajusta las tablas de codificación con un CSV sintético de casos."""
+    rng = np.random.default_rng(0)
+    n = 300
+    df = pd.DataFrame({col: rng.choice([f"{col}{i}" for i in range(5)], n) for col in CATEGORICAL_COLUMNS})
+    for col in ("ano", "semana", "ubigeo", "edad"):
+        df[col] = rng.integers(1, 100, n)
+    df["diagnostic"] = rng.integers(0, 3, n)
+    path = tmp_path_factory.mktemp("dengue") / "casos.csv"
+    df.to_csv(path, sep=";", index=False)
+    dengue_prediction.load_data(str(path))
+    return dengue_prediction
+
+
+def _random_records(n, seed=1):
+    rng = np.random.default_rng(seed)
+    records = []
+    for _ in range(n):
+        # El índice 5 no existe en el entrenamiento: valor no visto
+        record = {col: f"{col}{rng.integers(0, 6)}" for col in CATEGORICAL_COLUMNS}
+        record.update(ano=2023, semana=int(rng.integers(1, 53)), ubigeo=150103, edad=int(rng.integers(1, 90)))
+        for col in rng.choice(list(record), rng.integers(0, 3), replace=False):
+            if rng.random() < 0.5:
+                del record[col]
+            else:
+                record[col] = None
+        records.append(record)
+    return records
+
+
+def test_encode_record_matches_prepare_features(encoders):
+    records = _random_records(500)
+
+    batch = encoders.prepare_features(records)
+    rows = np.stack([encoders.encode_record(record) for record in records])
+
+    np.testing.assert_array_equal(rows, batch)
+
+
+def test_encode_record_writes_into_given_row(encoders):
+    row = np.full(len(encoders.feature_columns), 99, dtype=np.float32)
+    record = _random_records(1)[0]
+
+    assert encoders.encode_record(record, out=row) is row
+    np.testing.assert_array_equal(row, encoders.prepare_features([record])[0])
+
+
+def test_absent_categorical_fields_are_unknown(encoders):
+    for X in (encoders.encode_record({})[None, :], encoders.prepare_features([{}])):
+        assert encoders.unknown_fields(X) == [[col for col in encoders.feature_columns if col in CATEGORICAL_COLUMNS]]
+        numericas = [j for j, col in enumerate(encoders.feature_columns) if col not in CATEGORICAL_COLUMNS]
+        assert (X[0, numericas] == 0).all()
+
+
+def test_unseen_and_null_values_are_reported(encoders):
+    record = {col: f"{col}0" for col in CATEGORICAL_COLUMNS}
+    record.update(ano=2023, semana=10, ubigeo=150103, edad=30)
+    assert encoders.unknown_fields(encoders.encode_record(record)[None, :]) == [[]]
+
+    record.update(distrito="NO EXISTE", sexo=None)
+    X = encoders.encode_record(record)[None, :]
+    assert sorted(encoders.unknown_fields(X)[0]) == ["distrito", "sexo"]
+    assert X[0, encoders.feature_columns.index("distrito")] == UNKNOWN_CODE
+
+
+@pytest.mark.parametrize("value,expected", [(36, 36), (36.0, 36), ("36", 36), (1, 1), (53, 53)])
+def test_parse_week_accepts_integral_weeks(value, expected):
+    assert dengue_prediction.parse_week(value) == expected
+
+
+@pytest.mark.parametrize("value", [3.7, "3.7", 0, -1, 54, None, "abc", True, float("nan")])
+def test_parse_week_rejects_invalid_weeks(value):
+    with pytest.raises(ValueError):
+        dengue_prediction.parse_week(value)
+
+
+def test_trend_batch_rejects_invalid_week_before_predicting(encoders):
+    distrito = next(iter(encoders.encoding_tables["distrito"]))
+    with pytest.raises(ValueError, match="Semana inválida"):
+        encoders.predict_trend_batch(None, [{"distrito": distrito, "semana": 10}, {"distrito": distrito, "semana": 3.7}])
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from backend.login.gallery import GALLERY_DTYPES, EmbeddingGallery
+
+
+def _synthetic_gallery(n_users=2000, n_queries=200, noise=0.3, seed=0):
+    rng = np.random.default_rng(seed)
+    embeddings = rng.standard_normal((n_users, 128)).astype(np.float32)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    targets = rng.integers(0, n_users, n_queries)
+    queries = embeddings[targets] + rng.normal(0, noise, (n_queries, 128)).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    return embeddings, queries
+
+
+@pytest.mark.parametrize("dtype,min_agreement", [("float32", 1.0), ("float16", 0.99), ("int8", 0.97)])
+def test_top1_matches_exact_float32_search(dtype, min_agreement):
+    embeddings, queries = _synthetic_gallery()
+    exact_top1 = (embeddings @ queries.T).argmax(axis=0)
+
+    gallery = EmbeddingGallery(dtype).build(embeddings, [f"user{i}" for i in range(len(embeddings))])
+    top1 = np.array([gallery.search(q, top_k=1)[0][0] for q in queries])
+
+    assert (top1 == exact_top1).mean() >= min_agreement
+
+
+@pytest.mark.parametrize("dtype", GALLERY_DTYPES)
+def test_search_returns_cosine_similarity(dtype):
+    embeddings, queries = _synthetic_gallery(n_users=50, n_queries=10)
+    gallery = EmbeddingGallery(dtype).build(embeddings, [str(i) for i in range(50)])
+
+    for q in queries:
+        index, similarity = gallery.search(q, top_k=1)[0]
+        assert similarity == pytest.approx(float(embeddings[index] @ q), abs=5e-3)
+
+
+def test_int8_ranking_accounts_for_per_row_scale():
+    # La fila 1 coincide con la consulta pero tiene mayor valor absoluto máximo
+    # (escala mayor); sin aplicar la escala, la fila 0 ganaría en el recorrido int8.
+    spread = np.full(128, 1.0, dtype=np.float32)
+    peaked = np.zeros(128, dtype=np.float32)
+    peaked[0] = 1.0
+    peaked[1:] = 0.05
+    query = peaked.copy()
+
+    gallery = EmbeddingGallery("int8").build([spread, peaked], ["spread", "peaked"])
+    index, _ = gallery.search(query, top_k=1, rerank_candidates=1)[0]
+
+    assert gallery.labels[index] == "peaked"
+
+
+def test_int8_memory_per_user():
+    embeddings, _ = _synthetic_gallery(n_users=100, n_queries=1)
+    gallery = EmbeddingGallery("int8").build(embeddings, [str(i) for i in range(100)])
+    assert gallery.nbytes == 100 * (128 + 4)
+
+
+def test_empty_gallery_and_zero_query():
+    assert EmbeddingGallery("int8").search(np.ones(128)) == []
+    gallery = EmbeddingGallery("float32").build([np.ones(128)], ["a"])
+    assert gallery.search(np.zeros(128)) == []
+
+
+def test_unsupported_dtype():
+    with pytest.raises(ValueError):
+        EmbeddingGallery("int4")
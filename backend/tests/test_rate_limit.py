@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+from backend.login import rate_limit
+from backend.login.rate_limit import TokenBucketLimiter, embedding_fingerprint
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", fake)
+    return fake
+
+
+@pytest.fixture
+def rejected_state(monkeypatch):
+    rate_limit.rejected_embeddings.clear()
+    monkeypatch.setitem(rate_limit.shed_counters, "rejected_cache_hits", 0)
+    yield
+    rate_limit.rejected_embeddings.clear()
+
+
+def test_burst_allows_capacity_then_rejects(clock):
+    limiter = TokenBucketLimiter(rate=1, capacity=3)
+
+    assert [limiter.allow("a") for _ in range(4)] == [True, True, True, False]
+
+
+def test_tokens_refill_at_rate(clock):
+    limiter = TokenBucketLimiter(rate=2, capacity=3)
+    for _ in range(3):
+        limiter.allow("a")
+    assert not limiter.allow("a")
+
+    clock.now += 0.25
+    assert not limiter.allow("a")
+
+    clock.now += 0.25
+    assert limiter.allow("a")
+    assert not limiter.allow("a")
+
+
+def test_refill_is_capped_at_capacity(clock):
+    limiter = TokenBucketLimiter(rate=10, capacity=2)
+    limiter.allow("a")
+
+    clock.now += 3600
+    assert [limiter.allow("a") for _ in range(3)] == [True, True, False]
+
+
+def test_clients_have_independent_buckets(clock):
+    limiter = TokenBucketLimiter(rate=1, capacity=1)
+
+    assert limiter.allow("a")
+    assert not limiter.allow("a")
+    assert limiter.allow("b")
+
+
+def test_disabled_limiter_allows_everything(clock):
+    limiter = TokenBucketLimiter(rate=1, capacity=1)
+    limiter.enabled = False
+
+    assert all(limiter.allow("a") for _ in range(100))
+
+
+@pytest.mark.parametrize("rate,expected", [(0.25, 4), (2, 1), (1000, 1)])
+def test_retry_after_is_at_least_one_second(rate, expected):
+    assert TokenBucketLimiter(rate=rate, capacity=1).retry_after() == expected
+
+
+@pytest.mark.parametrize("rate,capacity", [(0, 10), (-1, 10), (float("nan"), 10), (1, 0)])
+def test_invalid_limits_are_rejected(rate, capacity):
+    with pytest.raises(ValueError):
+        TokenBucketLimiter(rate=rate, capacity=capacity)
+
+
+def test_fingerprint_ignores_differences_below_quantization_step():
+    embedding = np.random.default_rng(0).standard_normal(128)
+    embedding /= np.linalg.norm(embedding)
+    # Valores en el centro de cada paso, lejos de los límites de redondeo
+    embedding = np.round(embedding * rate_limit.FINGERPRINT_SCALE) / rate_limit.FINGERPRINT_SCALE
+    jitter = 0.4 / rate_limit.FINGERPRINT_SCALE
+
+    assert embedding_fingerprint(embedding.tolist()) == embedding_fingerprint((embedding + jitter).tolist())
+    assert embedding_fingerprint(embedding.tolist()) != embedding_fingerprint((-embedding).tolist())
+
+
+def test_rejected_fingerprint_short_circuits_until_cleared(rejected_state):
+    fingerprint = embedding_fingerprint([0.1] * 128)
+    assert not rate_limit.is_recently_rejected(fingerprint)
+
+    rate_limit.remember_rejected(fingerprint)
+    assert rate_limit.is_recently_rejected(fingerprint)
+    assert rate_limit.is_recently_rejected(fingerprint)
+    assert rate_limit.shed_counters["rejected_cache_hits"] == 2
+
+    # /register vacía la caché para que un usuario recién registrado pueda entrar
+    rate_limit.rejected_embeddings.clear()
+    assert not rate_limit.is_recently_rejected(fingerprint)
+
+
+def test_rejected_fingerprint_expires(clock, rejected_state):
+    fingerprint = embedding_fingerprint([0.1] * 128)
+    rate_limit.remember_rejected(fingerprint)
+
+    clock.now += rate_limit.REJECTED_CACHE_TTL + 1
+    assert not rate_limit.is_recently_rejected(fingerprint)
+    assert rate_limit.shed_counters["rejected_cache_hits"] == 0